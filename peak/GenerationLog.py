@@ -0,0 +1,34 @@
+import logging
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from . import PeakWorld
+
+logger = logging.getLogger("PEAK")
+
+
+class GenerationLog:
+    """
+    Per-slot generation log for PEAK.
+
+    Detail lines are only formatted when the slot's Generation Debug Logging option is on.
+    Otherwise the slot contributes a single summary record, written by flush().
+    """
+
+    def __init__(self, world: "PeakWorld"):
+        self.world = world
+        self.enabled = bool(world.options.debug_logging.value)
+        self.summary: Dict[str, Any] = {}
+
+    def debug(self, msg: str, *args: Any) -> None:
+        """Log a detail line; args are only interpolated if debug logging is on for this slot."""
+        if self.enabled:
+            logger.info("[Player %s] " + msg, self.world.player_name, *args)
+
+    def record(self, key: str, value: Any) -> None:
+        """Add a value to this slot's summary record."""
+        self.summary[key] = value
+
+    def flush(self) -> None:
+        """Write this slot's summary record."""
+        logger.info("[Player %s] PEAK generation summary: %s", self.world.player_name, self.summary)
@@ -0,0 +1,48 @@
+from typing import Iterable
+
+
+class IdBitset:
+    """
+    Immutable set of item or location ids stored as a single int bitmask.
+
+    Bit n stands for id base + n. PEAK ids are dense above a fixed base, so a few hundred ids fit in a few dozen
+    bytes, membership is a shift and a mask, and intersecting sets of the same base is a single int op.
+    """
+    __slots__ = ("base", "mask")
+
+    def __init__(self, base: int, mask: int = 0):
+        self.base = base
+        self.mask = mask
+
+    @classmethod
+    def from_ids(cls, base: int, ids: Iterable[int]) -> "IdBitset":
+        mask = 0
+        for id_ in ids:
+            if id_ < base:
+                raise ValueError(f"Id {id_} is below the bitset base {base}")
+            mask |= 1 << (id_ - base)
+        return cls(base, mask)
+
+    def __contains__(self, id_: int) -> bool:
+        offset = id_ - self.base
+        return offset >= 0 and self.mask >> offset & 1 == 1
+
+    def __bool__(self) -> bool:
+        return self.mask != 0
+
+    def _check_base(self, other: "IdBitset") -> None:
+        if other.base != self.base:
+            raise ValueError(f"Cannot combine bitsets with bases {self.base} and {other.base}")
+
+    def __and__(self, other: "IdBitset") -> "IdBitset":
+        self._check_base(other)
+        return IdBitset(self.base, self.mask & other.mask)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IdBitset) and other.base == self.base and other.mask == self.mask
+
+    def __hash__(self) -> int:
+        return hash((self.base, self.mask))
+
+    def __repr__(self) -> str:
+        return f"IdBitset({self.base}, {self.mask:#x})"
@@ -1,5 +1,9 @@
+import itertools
 import typing
+from random import Random
+
 from BaseClasses import Item, ItemClassification
+from .LazyTables import lazy_module_getattr
 
 
 class ItemData(typing.NamedTuple):
@@ -10,6 +14,7 @@ class ItemData(typing.NamedTuple):
 
 class PeakItem(Item):
     game: str = "PEAK"
+    __slots__ = ()  # Item is slotted; without this every PeakItem would also carry a __dict__
 
     def __init__(self, name: str, classification: ItemClassification, code: int = None, player: int = None):
         super(PeakItem, self).__init__(name, classification, code, player)
@@ -158,13 +163,44 @@ item_table = {
     **trap_table,
 }
 
-lookup_id_to_name: typing.Dict[int, str] = {
-    data.code: item_name for item_name, data in item_table.items() if data.code
-}
-
 item_groups: typing.Dict[str, typing.List[str]] = {
     "Progression":      list(progression_table.keys()),
     "Useful":           list(useful_table.keys()),
     "Filler":           list(filler_table.keys()),
     "Traps":            list(trap_table.keys()),
-}
\ No newline at end of file
+}
+
+
+def _build_lookup_id_to_name() -> typing.Dict[int, str]:
+    return {data.code: item_name for item_name, data in item_table.items() if data.code}
+
+
+__getattr__ = lazy_module_getattr(globals(), {"lookup_id_to_name": _build_lookup_id_to_name})
+
+
+def create_items_from_counts(counts: typing.Mapping[str, int], player: int) -> typing.List[PeakItem]:
+    """Create every item of a name -> count histogram, resolving each name's ItemData once."""
+    items: typing.List[PeakItem] = []
+    for name, count in counts.items():
+        if name not in item_table:
+            raise ValueError(f"Item '{name}' not found in item_table")
+        data = item_table[name]
+        items.extend(PeakItem(name, data.classification, data.code, player) for _ in range(count))
+    return items
+
+
+class WeightedSampler:
+    """Draws names with probability proportional to arbitrary non-negative integer weights."""
+
+    def __init__(self, weights: typing.Mapping[str, int]):
+        self.names: typing.List[str] = [name for name, weight in weights.items() if weight > 0]
+        self.cum_weights: typing.List[int] = list(itertools.accumulate(weights[name] for name in self.names))
+
+    def __bool__(self) -> bool:
+        return bool(self.names)
+
+    def sample(self, random: Random, k: int) -> typing.List[str]:
+        """Draw k names with replacement. Each draw is a bisect into the cumulative weights."""
+        if not self.names:
+            return []
+        return random.choices(self.names, cum_weights=self.cum_weights, k=k)
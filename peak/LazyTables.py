@@ -0,0 +1,17 @@
+from typing import Any, Callable, Dict
+
+
+def lazy_module_getattr(namespace: Dict[str, Any], builders: Dict[str, Callable[[], Any]]) -> Callable[[str], Any]:
+    """
+    Module-level __getattr__ for derived tables generation never reads.
+
+    Each table is built by its builder on first access and stored in the module namespace, so importing the module
+    costs nothing and later lookups are plain attribute reads.
+    """
+    def __getattr__(name: str) -> Any:
+        builder = builders.get(name)
+        if builder is None:
+            raise AttributeError(f"module {namespace['__name__']!r} has no attribute {name!r}")
+        value = namespace[name] = builder()
+        return value
+    return __getattr__
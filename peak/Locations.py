@@ -1,10 +1,34 @@
-from typing import Dict, Set
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from BaseClasses import Location
+from .IdSets import IdBitset
+from .LazyTables import lazy_module_getattr
+
+
+class LocationData(NamedTuple):
+    code: Optional[int]
+    category: str  # "badge", "luggage", "acquire", "sashe" or "event"
+    ascent: int = 0  # Ascent level the location belongs to, 0 if it is not tied to one
+    biome: Optional[str] = None  # Biome whose access event is required, if any
+    family: Optional[str] = None  # Badge family shared by every tier of a badge, e.g. "Volcanology"
+
+
+class LocationHint(NamedTuple):
+    name: str
+    category: str
+    ascent: int
+    biome: Optional[str]
+    family: Optional[str]
+
 
 class PeakLocation(Location):
     game = "PEAK"
+    __slots__ = ()  # Saves nothing while core Location is unslotted (as in 0.6.4); stops a __dict__ once it is slotted
+
+# Lowest location id; EXCLUDED_LOCATIONS and each region template's excluded ids are IdBitsets offset from it
+LOCATION_ID_BASE = 76100
 
-EXCLUDED_LOCATIONS: Set[int] = set()
+EXCLUDED_LOCATIONS: IdBitset = IdBitset(LOCATION_ID_BASE)
 
 # Main location table mapping location names to Archipelago numeric addresses
 LOCATION_TABLE: Dict[str, int] = {
@@ -212,4 +236,90 @@ LOCATION_TABLE: Dict[str, int] = {
     "Owl Scout sashe (Ascent 5)": 76314,
     "Wolf Scout sashe (Ascent 6)": 76315,
     "Goat Scout sashe (Ascent 7)": 76316,
-}
\ No newline at end of file
+}
+
+
+# Acquire locations that are only reachable once their biome has been accessed
+BIOME_LOCKED_LOCATIONS: Dict[str, List[str]] = {
+    "Mesa": [
+        "Acquire Cactus", "Acquire Aloe Vera", "Acquire Sunscreen", "Acquire Ancient Idol", "Acquire Red Prickleberry", "Acquire Gold Prickleberry", "Acquire Scorpion"
+    ],
+    "Alpine": [
+        "Acquire Orange Winterberry"
+    ],
+    "Roots": [
+        "Acquire Red Shroomberry", "Acquire Blue Shroomberry", "Acquire Yellow Shroomberry", "Acquire Green Shroomberry", "Acquire Purple Shroomberry",
+        "Acquire Mandrake"
+    ],
+}
+
+# Event locations (no numeric ID); each holds a locked progression item of the same name
+EVENT_LOCATIONS: Dict[str, LocationData] = {
+    **{f"Ascent {n} Completed": LocationData(None, "event", n) for n in range(1, 8)},
+    "Idol Dunked": LocationData(None, "event"),
+    "All Badges Collected": LocationData(None, "event"),
+    "Mesa Access": LocationData(None, "event"),
+    "Roots Access": LocationData(None, "event"),
+    "Alpine Access": LocationData(None, "event"),
+}
+
+_ascent_pattern = re.compile(r"\(Ascent (\d)\)$")
+_badge_family_pattern = re.compile(r"^(.+?)(?: [IVX]+)? Badge\b")
+_biome_by_location = {name: biome for biome, names in BIOME_LOCKED_LOCATIONS.items() for name in names}
+
+
+def _describe_location(name: str, code: int) -> LocationData:
+    if name.startswith("Acquire "):
+        category = "acquire"
+    elif "luggage" in name:
+        category = "luggage"
+    elif "Scout sashe" in name:
+        category = "sashe"
+    else:
+        category = "badge"
+    match = _ascent_pattern.search(name)
+    family = _badge_family_pattern.match(name) if category == "badge" else None
+    return LocationData(
+        code, category, int(match.group(1)) if match else 0, _biome_by_location.get(name), family and family.group(1)
+    )
+
+
+# Structured metadata for every location in LOCATION_TABLE, parsed once at import time
+LOCATION_METADATA: Dict[str, LocationData] = {
+    name: _describe_location(name, code) for name, code in LOCATION_TABLE.items()
+}
+
+# Locations and events that exist when the highest included ascent is the key (0-7)
+LOCATIONS_BY_ASCENT_CUTOFF: Dict[int, Tuple[str, ...]] = {
+    cutoff: tuple(name for name, data in LOCATION_METADATA.items() if data.ascent <= cutoff)
+    for cutoff in range(8)
+}
+EVENTS_BY_ASCENT_CUTOFF: Dict[int, Tuple[str, ...]] = {
+    cutoff: tuple(name for name, data in EVENT_LOCATIONS.items() if data.ascent <= cutoff)
+    for cutoff in range(8)
+}
+
+
+def get_ascent_cutoff(goal: int, ascent_count: int) -> int:
+    """Highest ascent whose locations are created. Only the Reach Peak goal (0) drops higher ascents."""
+    return ascent_count if goal == 0 else 7
+
+
+
+# Number of item-bearing (non-event) locations created for each (goal, ascent_count) option pair
+LOCATION_COUNTS: Dict[Tuple[int, int], int] = {
+    (goal, ascent_count): len(LOCATIONS_BY_ASCENT_CUTOFF[get_ascent_cutoff(goal, ascent_count)])
+    for goal in range(3)
+    for ascent_count in range(8)
+}
+
+
+def _build_location_hints() -> Dict[int, LocationHint]:
+    # Hint metadata for every location, keyed by location id so clients can resolve hints without parsing names
+    return {
+        data.code: LocationHint(name, data.category, data.ascent, data.biome, data.family)
+        for name, data in LOCATION_METADATA.items()
+    }
+
+
+__getattr__ = lazy_module_getattr(globals(), {"LOCATION_HINTS": _build_location_hints})
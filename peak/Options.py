@@ -1,5 +1,8 @@
-from dataclasses import dataclass
-from Options import Choice, PerGameCommonOptions, Range, Toggle, DeathLink, OptionGroup
+from dataclasses import dataclass, fields
+from typing import List, NamedTuple, Type
+
+from Options import Choice, PerGameCommonOptions, Range, NamedRange, Toggle, DeathLink, OptionGroup, Visibility
+from .Items import trap_table
 
 
 class Goal(Choice):
@@ -78,6 +81,35 @@ class HardRingLink(Toggle):
     display_name = "Hard Ring Link"
 
 
+class RingLinkInterval(Range):
+    """
+    Milliseconds over which Ring Link and Hard Ring Link changes are summed before being sent as one (0 sends every change)
+    
+    Requires a PeakPelago mod version that reads this option
+    """
+    display_name = "Ring Link Aggregation Interval"
+    # Hidden until the link services batch changes; they only read the ring_link, hard_ring_link and energy_link toggles
+    visibility = Visibility.none
+    range_start = 0
+    range_end = 10000
+    default = 0
+
+
+class RingLinkMinimumDelta(Range):
+    """
+    Smallest summed ring change that is sent; smaller totals are held until more changes push them past it (0 sends any change)
+    
+    Applies with or without an aggregation interval: without one, the total is sent as soon as it reaches this size.
+    Requires a PeakPelago mod version that reads this option
+    """
+    display_name = "Ring Link Minimum Delta"
+    # Hidden until the link services batch changes; they only read the ring_link, hard_ring_link and energy_link toggles
+    visibility = Visibility.none
+    range_start = 0
+    range_end = 100
+    default = 0
+
+
 class EnergyLink(Toggle):
     """
     When enabled, allows sending and receiving energy from a shared server pool
@@ -87,6 +119,35 @@ class EnergyLink(Toggle):
     display_name = "Energy Link"
 
 
+class EnergyLinkInterval(Range):
+    """
+    Milliseconds over which Energy Link contributions are summed before being sent as one (0 sends every contribution)
+    
+    Spending energy is always sent straight away. Requires a PeakPelago mod version that reads this option
+    """
+    display_name = "Energy Link Aggregation Interval"
+    # Hidden until the link services batch changes; they only read the ring_link, hard_ring_link and energy_link toggles
+    visibility = Visibility.none
+    range_start = 0
+    range_end = 10000
+    default = 0
+
+
+class EnergyLinkMinimumDelta(Range):
+    """
+    Smallest summed energy contribution that is sent; smaller totals are held until more contributions push them past it (0 sends any contribution)
+    
+    Applies with or without an aggregation interval: without one, the total is sent as soon as it reaches this size.
+    Requires a PeakPelago mod version that reads this option
+    """
+    display_name = "Energy Link Minimum Delta"
+    # Hidden until the link services batch changes; they only read the ring_link, hard_ring_link and energy_link toggles
+    visibility = Visibility.none
+    range_start = 0
+    range_end = 1000
+    default = 0
+
+
 class TrapLink(Toggle):
     """
     When enabled, traps you receive are also sent to other players with Trap Link enabled
@@ -124,14 +185,72 @@ class DeathLinkSendBehavior(Choice):
     option_all_players_dead = 1
     default = 0
 
-class BaseTrapWeight(Choice):
+
+class DeathLinkCoalesceWindow(Range):
+    """
+    Seconds after sending or receiving a Death Link during which further deaths in your game are folded into it
+    instead of being sent (0 sends every death)
+    
+    Death Links received within this window of the last one are ignored as well, so a death caused by a Death Link
+    does not bounce back out to everyone else. Requires a PeakPelago mod version that reads this option
+    """
+    display_name = "Death Link Coalesce Window"
+    # Hidden until the mod reads it; SendDeathLink only applies its fixed 5 second throttle today
+    visibility = Visibility.none
+    range_start = 0
+    range_end = 60
+    default = 0
+
+
+class DeathLinkMaxPerMinute(Range):
+    """
+    Most Death Links your game sends in any one minute; deaths past the limit are not sent (0 for no limit)
+    
+    Requires a PeakPelago mod version that reads this option
+    """
+    display_name = "Death Link Max Per Minute"
+    # Hidden until the mod reads it; SendDeathLink only applies its fixed 5 second throttle today
+    visibility = Visibility.none
+    range_start = 0
+    range_end = 60
+    default = 0
+
+
+class CompactSlotData(Toggle):
+    """
+    Send slot data in the compact, versioned format
+
+    Trap weights are sent as one number list and the on/off options as a single number, which shrinks the data the
+    mod downloads on every connect. Requires a PeakPelago mod version that reads the compact format
+    """
+    display_name = "Compact Slot Data"
+    # Hidden until the mod reads the compact format; the current plugin looks every option up by its legacy key
+    visibility = Visibility.none
+
+
+class DebugLogging(Toggle):
+    """
+    Write detailed generation logs for this slot
+
+    When disabled, generation only logs a single summary line for the slot
+    """
+    display_name = "Generation Debug Logging"
+
+
+class BaseTrapWeight(NamedRange):
     """
     Base Class for Trap Weights
+
+    Accepts any weight from 0 to 100, or one of the named weights none (0), low (1), medium (2) or high (4)
     """
-    option_none = 0
-    option_low = 1
-    option_medium = 2
-    option_high = 4
+    range_start = 0
+    range_end = 100
+    special_range_names = {
+        "none": 0,
+        "low": 1,
+        "medium": 2,
+        "high": 4,
+    }
     default = 2
 
 class InstantDeathTrapWeight(BaseTrapWeight):
@@ -286,6 +405,52 @@ class TrapPercentage(Range):
     default = 10
 
 
+class TrapData(NamedTuple):
+    item_name: str
+    option_name: str
+    slot_key: str
+    code: int
+    option: Type[BaseTrapWeight]
+
+
+def _trap(item_name: str, option_name: str, option: Type[BaseTrapWeight]) -> TrapData:
+    return TrapData(item_name, option_name, option_name.removesuffix("_weight"), trap_table[item_name].code, option)
+
+
+# Every weighted trap, in option display order. create_items, the active_traps slot data
+# and the Traps option group are all generated from this table.
+trap_registry: List[TrapData] = [
+    _trap("Instant Death Trap", "instant_death_trap_weight", InstantDeathTrapWeight),
+    _trap("Items to Bombs", "items_to_bombs_weight", ItemsToBombsWeight),
+    _trap("Pokemon Trivia Trap", "pokemon_trivia_trap_weight", PokemonTriviaTrapWeight),
+    _trap("Blackout Trap", "blackout_trap_weight", BlackoutTrapWeight),
+    _trap("Spawn Bee Swarm", "spawn_bee_swarm_weight", SpawnBeeSwarmWeight),
+    _trap("Banana Peel Trap", "banana_peel_trap_weight", BananaPeelTrapWeight),
+    _trap("Minor Poison Trap", "minor_poison_trap_weight", MinorPoisonTrapWeight),
+    _trap("Poison Trap", "poison_trap_weight", PoisonTrapWeight),
+    _trap("Deadly Poison Trap", "deadly_poison_trap_weight", DeadlyPoisonTrapWeight),
+    _trap("Tornado Trap", "tornado_trap_weight", TornadoTrapWeight),
+    _trap("Swap Trap", "swap_trap_weight", SwapTrapWeight),
+    _trap("Nap Time Trap", "nap_time_trap_weight", NapTimeTrapWeight),
+    _trap("Hungry Hungry Camper Trap", "hungry_hungry_camper_trap_weight", HungryHungryCamperTrapWeight),
+    _trap("Balloon Trap", "balloon_trap_weight", BalloonTrapWeight),
+    _trap("Slip Trap", "slip_trap_weight", SlipTrapWeight),
+    _trap("Freeze Trap", "freeze_trap_weight", FreezeTrapWeight),
+    _trap("Cold Trap", "cold_trap_weight", ColdTrapWeight),
+    _trap("Hot Trap", "hot_trap_weight", HotTrapWeight),
+    _trap("Injury Trap", "injury_trap_weight", InjuryTrapWeight),
+    _trap("Cactus Ball Trap", "cactus_ball_trap_weight", CactusBallTrapWeight),
+    _trap("Yeet Trap", "yeet_trap_weight", YeetTrapWeight),
+    _trap("Tumbleweed Trap", "tumbleweed_trap_weight", TumbleweedTrapWeight),
+    _trap("Zombie Horde Trap", "zombie_horde_trap_weight", ZombieHordeTrapWeight),
+    _trap("Gust Trap", "gust_trap_weight", GustTrapWeight),
+    _trap("Mandrake Trap", "mandrake_trap_weight", MandrakeTrapWeight),
+    _trap("Fungal Infection Trap", "fungal_infection_trap_weight", FungalInfectionTrapWeight),
+    _trap("Fear Trap", "fear_trap_weight", FearTrapWeight),
+    _trap("Scoutmaster Trap", "scoutmaster_trap_weight", ScoutmasterTrapWeight),
+]
+
+
 # Option Groups for better organization in the web UI
 peak_option_groups = [
     OptionGroup("General Options", [
@@ -300,43 +465,26 @@ peak_option_groups = [
     OptionGroup("Multiplayer Links", [
         RingLink,
         HardRingLink,
+        RingLinkInterval,
+        RingLinkMinimumDelta,
         EnergyLink,
+        EnergyLinkInterval,
+        EnergyLinkMinimumDelta,
         TrapLink,
         DeathLink,
         DeathLinkBehavior,
         DeathLinkSendBehavior,
+        DeathLinkCoalesceWindow,
+        DeathLinkMaxPerMinute,
     ]),
     OptionGroup("Traps", [
         TrapPercentage,
-        InstantDeathTrapWeight,
-        ItemsToBombsWeight,
-        PokemonTriviaTrapWeight,
-        BlackoutTrapWeight,
-        SpawnBeeSwarmWeight,
-        BananaPeelTrapWeight,
-        MinorPoisonTrapWeight,
-        PoisonTrapWeight,
-        DeadlyPoisonTrapWeight,
-        TornadoTrapWeight,
-        SwapTrapWeight,
-        NapTimeTrapWeight,
-        HungryHungryCamperTrapWeight,
-        BalloonTrapWeight,
-        SlipTrapWeight,
-        FreezeTrapWeight,
-        ColdTrapWeight,
-        HotTrapWeight,
-        InjuryTrapWeight,
-        CactusBallTrapWeight,
-        YeetTrapWeight,
-        TumbleweedTrapWeight,
-        ZombieHordeTrapWeight,
-        GustTrapWeight,
-        MandrakeTrapWeight,
-        FungalInfectionTrapWeight,
-        FearTrapWeight,
-        ScoutmasterTrapWeight,
+        *(trap.option for trap in trap_registry),
     ]),
+    OptionGroup("Debug", [
+        CompactSlotData,
+        DebugLogging,
+    ], start_collapsed=True),
 ]
 
 
@@ -350,11 +498,17 @@ class PeakOptions(PerGameCommonOptions):
 
     ring_link: RingLink
     hard_ring_link: HardRingLink
+    ring_link_interval: RingLinkInterval
+    ring_link_minimum_delta: RingLinkMinimumDelta
     energy_link: EnergyLink
+    energy_link_interval: EnergyLinkInterval
+    energy_link_minimum_delta: EnergyLinkMinimumDelta
     trap_link: TrapLink
     death_link: DeathLink
     death_link_behavior: DeathLinkBehavior
     death_link_send_behavior: DeathLinkSendBehavior
+    death_link_coalesce_window: DeathLinkCoalesceWindow
+    death_link_max_per_minute: DeathLinkMaxPerMinute
 
     trap_percentage: TrapPercentage
     instant_death_trap_weight: InstantDeathTrapWeight
@@ -384,4 +538,17 @@ class PeakOptions(PerGameCommonOptions):
     mandrake_trap_weight: MandrakeTrapWeight
     fungal_infection_trap_weight: FungalInfectionTrapWeight
     fear_trap_weight: FearTrapWeight
-    scoutmaster_trap_weight: ScoutmasterTrapWeight
\ No newline at end of file
+    scoutmaster_trap_weight: ScoutmasterTrapWeight
+
+    compact_slot_data: CompactSlotData
+    debug_logging: DebugLogging
+
+
+# A weighted trap is entered as an option class, a registry row and a PeakOptions field (_trap already fails on a row
+# without a trap_table item). Catch the fields drifting from the registry at import, not as an AttributeError mid-generation
+_trap_weight_fields = {
+    field.name: field.type for field in fields(PeakOptions)
+    if isinstance(field.type, type) and issubclass(field.type, BaseTrapWeight)
+}
+if _trap_weight_fields != {trap.option_name: trap.option for trap in trap_registry}:
+    raise RuntimeError("trap_registry and the trap weight fields of PeakOptions are out of sync")
@@ -0,0 +1,79 @@
+import math
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Tuple
+
+from .Items import WeightedSampler, useful_table
+from .Locations import LOCATION_COUNTS
+from .Options import trap_registry
+from .Regions import RegionTemplate, get_region_template
+
+if TYPE_CHECKING:
+    from . import PeakWorld
+    from .Options import PeakOptions
+
+# Options that decide a slot's regions and item pool; slots agreeing on all of them share one SlotPlan
+PLAN_OPTIONS: Tuple[str, ...] = (
+    "goal",
+    "ascent_count",
+    "progressive_stamina",
+    "additional_stamina_bars",
+    "trap_percentage",
+    *(trap.option_name for trap in trap_registry),
+)
+
+
+class SlotPlan(NamedTuple):
+    """Everything about a slot's regions and item pool that follows from its options, before any random draw."""
+    region_template: RegionTemplate
+    total_locations: int  # One item per non-event location
+    fixed_counts: Dict[str, int]  # Progression and useful items, in pool order
+    trap_sampler: WeightedSampler
+    trap_count: int
+    filler_count: int
+
+
+def plan_key(options: "PeakOptions") -> Tuple[Any, ...]:
+    return tuple(getattr(options, name).value for name in PLAN_OPTIONS)
+
+
+def build_slot_plan(options: "PeakOptions") -> SlotPlan:
+    goal_type = options.goal.value
+    required_ascent = options.ascent_count.value
+
+    # One item per non-event location; ascents above a Reach Peak goal are already left out of the count
+    total_locations = LOCATION_COUNTS[goal_type, required_ascent]
+
+    # Reach Peak only needs enough Progressive Ascents for the required level, other goals need all 7
+    fixed_counts: Dict[str, int] = {"Progressive Ascent": required_ascent if goal_type == 0 else 7}
+
+    # Progressive stamina: 4 bars to reach 100%, 7 with the additional bars
+    if options.progressive_stamina.value:
+        fixed_counts["Progressive Stamina Bar"] = 7 if options.additional_stamina_bars.value else 4
+
+    # One of every other useful item
+    for item_name in useful_table:
+        if item_name != "Progressive Stamina Bar":
+            fixed_counts[item_name] = fixed_counts.get(item_name, 0) + 1
+
+    # Traps replace TrapPercentage of the slots left over, filler takes the rest
+    remaining_slots = total_locations - sum(fixed_counts.values())
+    trap_sampler = WeightedSampler({
+        trap.item_name: getattr(options, trap.option_name).value for trap in trap_registry
+    })
+    trap_count = 0 if not trap_sampler else math.ceil(remaining_slots * (options.trap_percentage.value / 100.0))
+
+    return SlotPlan(
+        get_region_template(goal_type, required_ascent), total_locations, fixed_counts, trap_sampler, trap_count,
+        remaining_slots - trap_count,
+    )
+
+
+def assign_slot_plans(worlds: List["PeakWorld"]) -> int:
+    """Give every world the plan for its options, building one plan per distinct option tuple. Returns the plan count."""
+    plans: Dict[Tuple[Any, ...], SlotPlan] = {}
+    for world in worlds:
+        key = plan_key(world.options)
+        plan = plans.get(key)
+        if plan is None:
+            plan = plans[key] = build_slot_plan(world.options)
+        world.slot_plan = plan
+    return len(plans)
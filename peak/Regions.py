@@ -1,101 +1,136 @@
 # Regions.py
-import logging
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple, Tuple
 
 from BaseClasses import Region, LocationProgressType, Item, ItemClassification
+from .IdSets import IdBitset
 from .Locations import (
     PeakLocation,
+    LOCATION_ID_BASE,
     EXCLUDED_LOCATIONS,
-    LOCATION_TABLE
+    LOCATION_TABLE,
+    EVENT_LOCATIONS,
+    LOCATIONS_BY_ASCENT_CUTOFF,
+    EVENTS_BY_ASCENT_CUTOFF,
+    get_ascent_cutoff,
 )
+from .Rules import ALWAYS, ASCENT_ITEM, LOCATION_RULES, Requirement
 
 if TYPE_CHECKING:
     from . import PeakWorld
 
-def create_peak_regions(world: "PeakWorld"):
 
-    menu_region = Region("Menu", world.player, world.multiworld)
-    mountain_region = Region("Mountain", world.player, world.multiworld)
+class RegionTemplate(NamedTuple):
+    """Per-process description of a slot's regions, shared by every slot with the same goal and ascent cutoff."""
+    ascent_cutoff: int
+    regions: Tuple[str, ...]  # Every region below Menu, in creation order
+    # (parent region, region, requirement) for every entrance below Menu -> Mountain
+    entrances: Tuple[Tuple[str, str, Tuple[str, int]], ...]
+    locations: Tuple[Tuple[str, int, str], ...]  # (name, id, region)
+    excluded: IdBitset  # Ids of the created locations that are excluded
+    events: Tuple[Tuple[str, str], ...]  # (name, region)
+    requirements: Tuple[Tuple[str, int], ...]  # Distinct requirements used by entrances
+
+
+def region_for_requirement(requirement: Requirement) -> str:
+    """
+    Region holding the locations with this requirement.
+
+    Each ascent gets an "Ascent N" region behind N Progressive Ascents, and each biome gets a region behind
+    its access event, so a location's requirement is checked once per region instead of once per location.
+    """
+    if requirement is ALWAYS:
+        return "Mountain"
+    item, count = requirement
+    if item == ASCENT_ITEM:
+        return f"Ascent {count}"
+    return item.removesuffix(" Access")
 
-    world.multiworld.regions.extend([menu_region, mountain_region])
-    menu_region.connect(mountain_region)
 
-    # Determine which ascent levels should be excluded based on goal settings
+@lru_cache(maxsize=None)
+def _build_region_template(ascent_cutoff: int) -> RegionTemplate:
+    # Locations above the cutoff ascent are simply absent from the index, so they are never created
+    locations = tuple(
+        (name, LOCATION_TABLE[name], region_for_requirement(LOCATION_RULES[name]))
+        for name in LOCATIONS_BY_ASCENT_CUTOFF[ascent_cutoff]
+    )
+    excluded = EXCLUDED_LOCATIONS & IdBitset.from_ids(LOCATION_ID_BASE, (loc_id for _, loc_id, _ in locations))
+    events = tuple((name, region_for_requirement(LOCATION_RULES[name])) for name in EVENTS_BY_ASCENT_CUTOFF[ascent_cutoff])
+    requirements = dict.fromkeys(
+        LOCATION_RULES[name] for name in LOCATIONS_BY_ASCENT_CUTOFF[ascent_cutoff] + EVENTS_BY_ASCENT_CUTOFF[ascent_cutoff]
+    )
+
+    # Ascent regions form a chain, each one requiring one more Progressive Ascent than the last
+    highest_ascent = max((count for item, count in filter(None, requirements) if item == ASCENT_ITEM), default=0)
+    entrances = [
+        ("Mountain" if n == 1 else f"Ascent {n - 1}", f"Ascent {n}", (ASCENT_ITEM, n))
+        for n in range(1, highest_ascent + 1)
+    ]
+    # Biome regions hang off the Mountain behind their access events
+    entrances += [
+        ("Mountain", region_for_requirement(requirement), requirement)
+        for requirement in requirements if requirement is not ALWAYS and requirement[0] != ASCENT_ITEM
+    ]
+
+    regions = ("Mountain", *(region for _, region, _ in entrances))
+    return RegionTemplate(
+        ascent_cutoff, regions, tuple(entrances), locations, excluded, events,
+        tuple(dict.fromkeys(requirement for _, _, requirement in entrances)),
+    )
+
+
+def get_region_template(goal: int, ascent_count: int) -> RegionTemplate:
+    """Template for a (goal, ascent_count) pair. Pairs with the same ascent cutoff share one template."""
+    return _build_region_template(get_ascent_cutoff(goal, ascent_count))
+
+
+def create_peak_regions(world: "PeakWorld"):
+
+    # Determine which ascent levels should be included based on goal settings
     required_ascent = world.options.ascent_count.value
     goal_type = world.options.goal.value
-    
-    logging.info(f"[Player {world.multiworld.player_name[world.player]}] Goal Type: {goal_type}, Required Ascent: {required_ascent}")
-    
-    # If goal is "Reach Peak" (0), exclude ascent badges above the required level
-    excluded_ascent_levels = set()
-    if goal_type == 0:  # Reach Peak goal
-        for ascent_level in range(required_ascent + 1, 8):  # Ascents above required level
-            excluded_ascent_levels.add(ascent_level)
-    
-    logging.info(f"[Player {world.multiworld.player_name[world.player]}] Excluded ascent levels: {excluded_ascent_levels}")
-    
-    excluded_location_count = 0
-    created_location_count = 0
-
-    # Add all regular locations from LOCATION_TABLE
-    for name, loc_id in LOCATION_TABLE.items():
-        # Skip creating locations that should be excluded
-        should_skip = False
-        if goal_type == 0:  # Only skip if goal is Reach Peak
-            for level in excluded_ascent_levels:
-                if f"(Ascent {level})" in name:
-                    should_skip = True
-                    excluded_location_count += 1
-                    logging.info(f"[Player {world.multiworld.player_name[world.player]}] SKIPPING CREATION: {name}")
-                    break
-        
-        if should_skip:
-            continue  # Don't create this location at all
-        
-        loc = PeakLocation(world.player, name, loc_id, parent=mountain_region)
-        
+    template = world.slot_plan.region_template
+    world.region_template = template
+
+    world.log.debug("Goal Type: %s, Required Ascent: %s", goal_type, required_ascent)
+    world.log.debug("Including ascent levels up to: %s", template.ascent_cutoff)
+
+    player = world.player
+    menu_region = Region("Menu", player, world.multiworld)
+    regions = {name: Region(name, player, world.multiworld) for name in template.regions}
+    world.multiworld.regions.extend([menu_region, *regions.values()])
+    menu_region.connect(regions["Mountain"])
+
+    # Entrance rules are applied by set_rules, in template order
+    world.peak_entrances = [
+        regions[parent].connect(regions[region]) for parent, region, _ in template.entrances
+    ]
+
+    locations = []
+    excluded = template.excluded
+    for name, loc_id, region_name in template.locations:
+        loc = PeakLocation(player, name, loc_id, parent=regions[region_name])
+
         # Mark location as excluded if it's in EXCLUDED_LOCATIONS
-        if loc_id in EXCLUDED_LOCATIONS:
+        if excluded and loc_id in excluded:
             loc.progress_type = LocationProgressType.EXCLUDED
-        
-        mountain_region.locations.append(loc)
-        created_location_count += 1
+
+        locations.append(loc)
 
     # Add event locations (no numeric ID) — become progression items when checked
-    event_locations = [
-        ("Ascent 1 Completed", "Ascent 1 Completed"),
-        ("Ascent 2 Completed", "Ascent 2 Completed"),
-        ("Ascent 3 Completed", "Ascent 3 Completed"),
-        ("Ascent 4 Completed", "Ascent 4 Completed"),
-        ("Ascent 5 Completed", "Ascent 5 Completed"),
-        ("Ascent 6 Completed", "Ascent 6 Completed"),
-        ("Ascent 7 Completed", "Ascent 7 Completed"),
-        ("Idol Dunked", "Idol Dunked"),
-        ("All Badges Collected", "All Badges Collected"),
-        ("Mesa Access", "Mesa Access"),
-        ("Roots Access", "Roots Access"),
-        ("Alpine Access", "Alpine Access"),
-    ]
-    
-    for loc_name, item_name in event_locations:
-        # Skip creating event locations for excluded ascents
-        should_skip_event = False
-        if goal_type == 0:
-            for level in excluded_ascent_levels:
-                if f"Ascent {level} Completed" == loc_name:
-                    should_skip_event = True
-                    excluded_location_count += 1
-                    logging.info(f"[Player {world.multiworld.player_name[world.player]}] SKIPPING EVENT CREATION: {loc_name}")
-                    break
-        
-        if should_skip_event:
-            continue  # Don't create this event location at all
-        
-        ev_loc = PeakLocation(world.player, loc_name, None, parent=mountain_region)
-        ev_loc.place_locked_item(Item(item_name, ItemClassification.progression, None, world.player))
-        mountain_region.locations.append(ev_loc)
-        created_location_count += 1
-
-    logging.info(f"[Player {world.multiworld.player_name[world.player]}] Total excluded locations: {excluded_location_count}")
-    logging.info(f"[Player {world.multiworld.player_name[world.player]}] Total created locations: {created_location_count}")
-    logging.info(f"[Player {world.multiworld.player_name[world.player]}] Created {len(mountain_region.locations)} locations in Mountain region")
\ No newline at end of file
+    for loc_name, region_name in template.events:
+        ev_loc = PeakLocation(player, loc_name, None, parent=regions[region_name])
+        ev_loc.place_locked_item(Item(loc_name, ItemClassification.progression, None, player))
+        locations.append(ev_loc)
+
+    for loc in locations:
+        loc.parent_region.locations.append(loc)
+
+    created_location_count = len(locations)
+    excluded_location_count = len(LOCATION_TABLE) + len(EVENT_LOCATIONS) - created_location_count
+
+    world.log.record("ascent_cutoff", template.ascent_cutoff)
+    world.log.record("created_locations", created_location_count)
+    world.log.record("excluded_locations", excluded_location_count)
+    world.log.debug("Total excluded locations: %s", excluded_location_count)
+    world.log.debug("Created %s locations in %s regions", created_location_count, len(regions))
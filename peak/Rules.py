@@ -1,6 +1,8 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Tuple
 
-from BaseClasses import Location, Entrance
+from BaseClasses import Location, Entrance, CollectionState, MultiWorld
+from worlds.AutoWorld import LogicMixin
+from .Locations import LocationData, LOCATION_METADATA, EVENT_LOCATIONS, BIOME_LOCKED_LOCATIONS
 
 if TYPE_CHECKING:
     from . import PeakWorld
@@ -20,166 +22,153 @@ def add_rule(spot: Location | Entrance, rule, combine="and"):
             spot.access_rule = lambda state: rule(state) or old_rule(state)
 
 
-def apply_rules(world: "PeakWorld"):
-    """Apply all access rules for Peak locations."""
-    player = world.player
-    required_ascent = world.options.ascent_count.value
-    goal_type = world.options.goal.value
-    
-    # All regular badge locations are always accessible
-    regular_badges = [
-        "Astronomy Badge", "24 Karat Badge", "Gourmand Badge", "Daredevil Badge",
-        "Mycology Badge", "Megaentomology Badge", "Speed Climber Badge", "Bookwork Badge",
-        "Balloon Badge", "Nomad Badge", "Animal Serenading Badge", "Arborist Badge",
-        "Endurance Badge", "Toxicology Badge", "Foraging Badge", "Bouldering Badge",
-        "Bing Bong Badge", "Cooking Badge", "Plunderer Badge", "Lone Wolf Badge",
-        "Volcanology Badge", "Alpinist Badge", "Esoterica Badge", "Trailblazer Badge",
-        "Beachcomber Badge", "Mentorship Badge", "Cool Cucumber Badge", "Naturalist Badge",
-        "Aeronautics Badge", "Leave No Trace Badge", "Needlepoint Badge", "Knot Tying Badge",
-        "Bundled Up Badge", "Forestry Badge", "Disaster Response Badge", "Competitive Eating Badge",
-        "Tread Lightly Badge", "Cryptogastronomy Badge", "Calcium Intake Badge", "Advanced Mycology Badge",
-        "Applied Esoterica Badge", "Undead Encounter Badge", "Web Security Badge", "Mycoacrobatics Badge",
-        "Survivalist Badge", "Happy Camper Badge", "First Aid Badge", "Clutch Badge",
-        "Emergency Preparedness Badge", "Ascender Badge", "Bookworm Badge", "Resourcefulness Badge",
-        "Ultimate Badge", "Peak Badge", "High Altitude Badge"
-    ]
-    
-    for badge_name in regular_badges:
-        try:
-            set_rule(world.get_location(badge_name), lambda state: True)
-        except KeyError:
-            pass
-    
-    # Luggage locations are always accessible
-    luggage_locations = [
-        "Open 1 luggage", "Open 5 luggage in a single run", "Open 10 luggage",
-        "Open 10 luggage in a single run", "Open 20 luggage in a single run",
-        "Open 25 luggage", "Open 50 luggage"
-    ]
-    
-    for luggage_name in luggage_locations:
-        try:
-            set_rule(world.get_location(luggage_name), lambda state: True)
-        except KeyError:
-            pass
-    
-    # Ascent locations require their corresponding Ascent Completed events
-    roman_numerals = ["II", "III", "IV", "V", "VI", "VII", "VIII"]
-
-    max_relevant_ascent = 7
-    if goal_type == 0: # Peak Goal
-        max_relevant_ascent = required_ascent
-    
-    for ascent_num in range(1, max_relevant_ascent + 1):  # Only set rules for relevant ascents
-        roman_num = roman_numerals[ascent_num - 1]
-        ascent_locations = [
-            f"Beachcomber {roman_num} Badge (Ascent {ascent_num})", 
-            f"Trailblazer {roman_num} Badge (Ascent {ascent_num})",
-            f"Alpinist {roman_num} Badge (Ascent {ascent_num})", 
-            f"Volcanology {roman_num} Badge (Ascent {ascent_num})",
-            f"Nomad {roman_num} Badge (Ascent {ascent_num})",
-            f"Forestry {roman_num} Badge (Ascent {ascent_num})"
-        ]
-        
-        for ascent_name in ascent_locations:
-            try:
-                # Require 'ascent_num' Progressive Ascent items to access this ascent's locations
-                set_rule(world.get_location(ascent_name), 
-                        lambda state, asc=ascent_num: state.has("Progressive Ascent", player, asc))
-            except KeyError:
-                pass
-    
-    # Event locations require Progressive Ascent items
-    for ascent_num in range(1, max_relevant_ascent + 1):
-        try:
-            # Require 'ascent_num' Progressive Ascent items to complete that ascent
-            set_rule(world.get_location(f"Ascent {ascent_num} Completed"), 
-                    lambda state, asc=ascent_num: state.has("Progressive Ascent", player, asc))
-        except KeyError:
-            pass
-    
-    # Acquire locations - most are always accessible
-    acquire_locations = [
-        "Acquire Rope Spool", "Acquire Rope Cannon", "Acquire Anti-Rope Spool", "Acquire Anti-Rope Cannon",
-        "Acquire Chain Launcher", "Acquire Piton", "Acquire Magic Bean", "Acquire Parasol",
-        "Acquire Balloon", "Acquire Balloon Bunch", "Acquire Scout Cannon", "Acquire Portable Stove",
-        "Acquire Checkpoint Flag", "Acquire Lantern", "Acquire Flare", "Acquire Torch",
-        "Acquire Compass", "Acquire Pirate's Compass", "Acquire Binoculars", "Acquire Flying Disc",
-        "Acquire Bandages", "Acquire First-Aid Kit", "Acquire Antidote", "Acquire Heat Pack",
-        "Acquire Cure-All", "Acquire Faerie Lantern", "Acquire Scout Effigy",
-        "Acquire Cursed Skull", "Acquire Pandora's Lunchbox", "Acquire Bugle of Friendship",
-        "Acquire Bugle", "Acquire Remedy Fungus", "Acquire Medicinal Root", "Acquire Guidebook",
-        "Acquire Shelf Shroom", "Acquire Bounce Shroom", "Acquire Trail Mix",
-        "Acquire Granola Bar", "Acquire Scout Cookies", "Acquire Airline Food", "Acquire Energy Drink",
-        "Acquire Sports Drink", "Acquire Big Lollipop", "Acquire Button Shroom", "Acquire Bugle Shroom",
-        "Acquire Cluster Shroom", "Acquire Chubby Shroom", "Acquire Conch", "Acquire Berrynana Peel",
-        "Acquire Dynamite", "Acquire Bing Bong", "Acquire Red Crispberry", "Acquire Green Crispberry",
-        "Acquire Yellow Crispberry", "Acquire Coconut", "Acquire Coconut Half", "Acquire Brown Berrynana",
-        "Acquire Blue Berrynana", "Acquire Pink Berrynana", "Acquire Yellow Berrynana", "Acquire Yellow Winterberry",
-        "Acquire Strange Gem", "Acquire Egg", "Acquire Cooked Bird", "Acquire Honeycomb", "Acquire Beehive", "Acquire Big Egg",
-        "Acquire Book of Bones", "Acquire Marshmallow", "Acquire Glizzy", "Acquire Rescue Claw", "Acquire Fortified Milk", "Acquire Cloud Fungus"
-    ]
-    
-    for acquire_name in acquire_locations:
-        try:
-            set_rule(world.get_location(acquire_name), lambda state: True)
-        except KeyError:
-            pass
-    
-    # Mesa-locked items require Mesa Access
-    mesa_locked_items = [
-        "Acquire Cactus", "Acquire Aloe Vera", "Acquire Sunscreen", "Acquire Ancient Idol", "Acquire Red Prickleberry", "Acquire Gold Prickleberry", "Acquire Scorpion"
-    ]
-    
-    for mesa_item in mesa_locked_items:
-        try:
-            set_rule(world.get_location(mesa_item), 
-                    lambda state: state.has("Mesa Access", player))
-        except KeyError:
-            pass
-    
-    # Alpine-locked items require Alpine Access
-    alpine_locked_items = [
-        "Acquire Orange Winterberry"
-    ]
-    
-    for alpine_item in alpine_locked_items:
-        try:
-            set_rule(world.get_location(alpine_item), 
-                    lambda state: state.has("Alpine Access", player))
-        except KeyError:
-            pass
-
-    # Roots-locked items require Roots Access
-    roots_locked_items = [
-        "Acquire Red Shroomberry", "Acquire Blue Shroomberry", "Acquire Yellow Shroomberry", "Acquire Green Shroomberry", "Acquire Purple Shroomberry",
-        "Acquire Mandrake"
-    ]
-
-    for roots_item in roots_locked_items:
-        try:
-            set_rule(world.get_location(roots_item), 
-                    lambda state: state.has("Roots Access", player))
-        except KeyError:
-            pass
-    
-    # Scout sashe locations require all previous ascents to be completed
-    scout_sashe_requirements = {
-        "Rabbit Scout sashe (Ascent 1)": [],  # No requirements
-        "Raccoon Scout sashe (Ascent 2)": ["Ascent 1 Completed"],
-        "Mule Scout sashe (Ascent 3)": ["Ascent 1 Completed", "Ascent 2 Completed"],
-        "Kangaroo Scout sashe (Ascent 4)": ["Ascent 1 Completed", "Ascent 2 Completed", "Ascent 3 Completed"],
-        "Owl Scout sashe (Ascent 5)": ["Ascent 1 Completed", "Ascent 2 Completed", "Ascent 3 Completed", "Ascent 4 Completed"],
-        "Wolf Scout sashe (Ascent 6)": ["Ascent 1 Completed", "Ascent 2 Completed", "Ascent 3 Completed", "Ascent 4 Completed", "Ascent 5 Completed"],
-        "Goat Scout sashe (Ascent 7)": ["Ascent 1 Completed", "Ascent 2 Completed", "Ascent 3 Completed", "Ascent 4 Completed", "Ascent 5 Completed", "Ascent 6 Completed"]
+# Requirement for a location: an (item, count) pair that must be held, or ALWAYS.
+Requirement = Optional[Tuple[str, int]]
+ALWAYS: Requirement = None
+
+ASCENT_ITEM = "Progressive Ascent"
+
+# One bit per biome access event in PeakLogic.peak_biomes
+BIOME_ACCESS_BITS: Dict[str, int] = {f"{biome} Access": 1 << i for i, biome in enumerate(BIOME_LOCKED_LOCATIONS)}
+
+
+class PeakLogic(LogicMixin):
+    """
+    Per-player PEAK progress cached on CollectionState and kept current by PeakWorld.collect/remove.
+
+    peak_ascent holds the number of Progressive Ascents collected and peak_biomes the BIOME_ACCESS_BITS of the
+    collected access events, so every PEAK rule is a single integer comparison or bit test.
+    """
+    peak_ascent: Dict[int, int]
+    peak_biomes: Dict[int, int]
+
+    def init_mixin(self, multiworld: MultiWorld) -> None:
+        players = multiworld.get_game_players("PEAK")
+        self.peak_ascent = {player: 0 for player in players}
+        self.peak_biomes = {player: 0 for player in players}
+
+    def copy_mixin(self, new_state: CollectionState) -> CollectionState:
+        new_state.peak_ascent = self.peak_ascent.copy()
+        new_state.peak_biomes = self.peak_biomes.copy()
+        return new_state
+
+
+def update_logic_cache(state: CollectionState, player: int, item_name: str) -> None:
+    """Refresh the cached PeakLogic value affected by collecting or removing item_name."""
+    if item_name == ASCENT_ITEM:
+        state.peak_ascent[player] = state.prog_items[player][ASCENT_ITEM]
+    elif item_name in BIOME_ACCESS_BITS:
+        bit = BIOME_ACCESS_BITS[item_name]
+        if state.prog_items[player][item_name] > 0:
+            state.peak_biomes[player] |= bit
+        else:
+            state.peak_biomes[player] &= ~bit
+
+
+def location_requirement(data: LocationData) -> Requirement:
+    """Requirement for a location, derived from its metadata."""
+    if data.biome is not None:
+        return (f"{data.biome} Access", 1)
+    if data.category == "sashe":
+        # Scout sashes require every previous ascent to be completed, which is a single count check
+        return (ASCENT_ITEM, data.ascent - 1) if data.ascent > 1 else ALWAYS
+    if data.ascent:
+        # Ascent badges and Ascent Completed events require 'ascent' Progressive Ascent items
+        return (ASCENT_ITEM, data.ascent)
+    return ALWAYS
+
+
+def build_rule_table() -> Dict[str, Requirement]:
+    """Build the declarative location -> requirement table from the location metadata."""
+    return {
+        name: location_requirement(data)
+        for name, data in {**LOCATION_METADATA, **EVENT_LOCATIONS}.items()
     }
-    
-    for scout_name, required_ascents in scout_sashe_requirements.items():
-        try:
-            if not required_ascents:  # Rabbit Scout sashe (Ascent 1) has no requirements
-                set_rule(world.get_location(scout_name), lambda state: True)
-            else:
-                set_rule(world.get_location(scout_name), 
-                        lambda state, reqs=required_ascents: all(state.has(ascent, player) for ascent in reqs))
-        except KeyError:
-            pass
\ No newline at end of file
+
+
+LOCATION_RULES: Dict[str, Requirement] = build_rule_table()
+
+
+class PeakRule:
+    """
+    Slotted player holder shared by the PEAK access rules.
+
+    Rules are small slotted objects rather than lambdas, so a generated multiworld can be pickled. Each subclass
+    defines test, and spots are given the bound method, which pickles as (rule, "test") and calls as fast as a
+    lambda would.
+    """
+    __slots__ = ("player",)
+
+    def __init__(self, player: int):
+        self.player = player
+
+
+class AscentRule(PeakRule):
+    """At least count Progressive Ascents, read from the PeakLogic cache."""
+    __slots__ = ("count",)
+
+    def __init__(self, player: int, count: int):
+        super().__init__(player)
+        self.count = count
+
+    def test(self, state: CollectionState) -> bool:
+        return state.peak_ascent[self.player] >= self.count
+
+    def __repr__(self) -> str:
+        return f"AscentRule({self.player}, {self.count})"
+
+
+class BiomeRule(PeakRule):
+    """A biome access event, read from the PeakLogic cache."""
+    __slots__ = ("bit",)
+
+    def __init__(self, player: int, bit: int):
+        super().__init__(player)
+        self.bit = bit
+
+    def test(self, state: CollectionState) -> bool:
+        return state.peak_biomes[self.player] & self.bit != 0
+
+    def __repr__(self) -> str:
+        return f"BiomeRule({self.player}, {self.bit})"
+
+
+class HasRule(PeakRule):
+    """At least count of any other item."""
+    __slots__ = ("item", "count")
+
+    def __init__(self, player: int, item: str, count: int = 1):
+        super().__init__(player)
+        self.item = item
+        self.count = count
+
+    def test(self, state: CollectionState) -> bool:
+        return state.has(self.item, self.player, self.count)
+
+    def __repr__(self) -> str:
+        return f"HasRule({self.player}, {self.item!r}, {self.count})"
+
+
+def compile_rules(player: int, requirements: Iterable[Requirement]) -> Dict[Tuple[str, int], Callable[[CollectionState], bool]]:
+    """Compile each distinct requirement into one shared rule for the given player."""
+    compiled = {}
+    for requirement in requirements:
+        if requirement is ALWAYS or requirement in compiled:
+            continue
+        item, count = requirement
+        if item == ASCENT_ITEM:
+            compiled[requirement] = AscentRule(player, count).test
+        elif item in BIOME_ACCESS_BITS:
+            compiled[requirement] = BiomeRule(player, BIOME_ACCESS_BITS[item]).test
+        else:
+            compiled[requirement] = HasRule(player, item, count).test
+    return compiled
+
+
+def apply_rules(world: "PeakWorld"):
+    """Apply all access rules for Peak, using the entrances of the slot's region template."""
+    compiled = compile_rules(world.player, world.region_template.requirements)
+
+    # Every requirement is carried by an entrance, so locations keep the default rule
+    for entrance, (_, _, requirement) in zip(world.peak_entrances, world.region_template.entrances):
+        set_rule(entrance, compiled[requirement])
@@ -0,0 +1,123 @@
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+from .Options import PeakOptions, TrapData, trap_registry
+
+if TYPE_CHECKING:
+    from . import PeakWorld
+
+# Version tag of the compact format. The legacy format carries no tag and counts as version 1, so compact payloads
+# start at 2. Bump this whenever the compact key set changes, and record added value options in SLOT_VALUE_ADDED
+COMPACT_SLOT_DATA_VERSION = 3
+
+# Options sent as one bit each in the compact "flags" field, lowest bit first. Only ever append to this tuple
+SLOT_FLAG_OPTIONS: Tuple[str, ...] = (
+    "progressive_stamina",
+    "additional_stamina_bars",
+    "ring_link",
+    "hard_ring_link",
+    "energy_link",
+    "trap_link",
+    "death_link",
+)
+
+# Options sent as plain numbers in both formats
+SLOT_VALUE_OPTIONS: Tuple[str, ...] = (
+    "goal",
+    "ascent_count",
+    "badge_count",
+    "trap_percentage",
+    "ring_link_interval",
+    "ring_link_minimum_delta",
+    "energy_link_interval",
+    "energy_link_minimum_delta",
+    "death_link_behavior",
+    "death_link_send_behavior",
+    "death_link_coalesce_window",
+    "death_link_max_per_minute",
+)
+
+# Value options added after the first compact version, with the version that added them. Older compact payloads
+# lack these keys and decode to the option's default
+SLOT_VALUE_ADDED: Dict[str, int] = {
+    "ring_link_interval": 3,
+    "ring_link_minimum_delta": 3,
+    "energy_link_interval": 3,
+    "energy_link_minimum_delta": 3,
+    "death_link_coalesce_window": 3,
+    "death_link_max_per_minute": 3,
+}
+
+_option_defaults: Dict[str, Any] = {field.name: field.type.default for field in fields(PeakOptions)}
+
+# Order of the compact "trap_weights" list: ascending trap item id
+TRAP_WEIGHT_ORDER: Tuple[TrapData, ...] = tuple(sorted(trap_registry, key=lambda trap: trap.code))
+
+
+def session_id(world: "PeakWorld") -> str:
+    return f"{world.multiworld.seed_name}_{world.player}"
+
+
+def legacy_slot_data(world: "PeakWorld") -> Dict[str, Any]:
+    """Slot data in the original format, one key per option and a slot key -> weight map for traps."""
+    options = world.options
+    return {
+        "goal": options.goal.value,
+        "ascent_count": options.ascent_count.value,
+        "badge_count": options.badge_count.value,
+        "progressive_stamina": options.progressive_stamina.value,
+        "additional_stamina_bars": options.additional_stamina_bars.value,
+        "trap_percentage": options.trap_percentage.value,
+        "ring_link": options.ring_link.value,
+        "hard_ring_link": options.hard_ring_link.value,
+        "ring_link_interval": options.ring_link_interval.value,
+        "ring_link_minimum_delta": options.ring_link_minimum_delta.value,
+        "energy_link": options.energy_link.value,
+        "energy_link_interval": options.energy_link_interval.value,
+        "energy_link_minimum_delta": options.energy_link_minimum_delta.value,
+        "trap_link": options.trap_link.value,
+        "death_link": options.death_link.value,
+        "death_link_behavior": options.death_link_behavior.value,
+        "death_link_send_behavior": options.death_link_send_behavior.value,
+        "death_link_coalesce_window": options.death_link_coalesce_window.value,
+        "death_link_max_per_minute": options.death_link_max_per_minute.value,
+        "active_traps": world.output_active_traps(),
+        "session_id": session_id(world),
+    }
+
+
+def compact_slot_data(world: "PeakWorld") -> Dict[str, Any]:
+    """
+    Slot data in the compact format.
+
+    "flags" packs the SLOT_FLAG_OPTIONS toggles, and "trap_weights" lists every trap weight in TRAP_WEIGHT_ORDER.
+    """
+    options = world.options
+    slot_data: Dict[str, Any] = {"version": COMPACT_SLOT_DATA_VERSION}
+    slot_data.update((name, getattr(options, name).value) for name in SLOT_VALUE_OPTIONS)
+    slot_data["flags"] = sum(
+        1 << bit for bit, name in enumerate(SLOT_FLAG_OPTIONS) if getattr(options, name).value
+    )
+    slot_data["trap_weights"] = [getattr(options, trap.option_name).value for trap in TRAP_WEIGHT_ORDER]
+    slot_data["session_id"] = session_id(world)
+    return slot_data
+
+
+def expand_slot_data(slot_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return slot data in the legacy format, expanding it first if it is compact. Reference decoder for clients."""
+    if "version" not in slot_data:
+        return slot_data
+    version = slot_data["version"]
+    if not 2 <= version <= COMPACT_SLOT_DATA_VERSION:
+        raise ValueError(f"Unsupported PEAK slot data version: {version}")
+
+    expanded = {
+        name: slot_data[name] if version >= SLOT_VALUE_ADDED.get(name, 2) else _option_defaults[name]
+        for name in SLOT_VALUE_OPTIONS
+    }
+    expanded.update((name, int(slot_data["flags"] >> bit & 1)) for bit, name in enumerate(SLOT_FLAG_OPTIONS))
+    expanded["active_traps"] = {
+        trap.slot_key: weight for trap, weight in zip(TRAP_WEIGHT_ORDER, slot_data["trap_weights"])
+    }
+    expanded["session_id"] = slot_data["session_id"]
+    return expanded
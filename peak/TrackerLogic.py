@@ -0,0 +1,105 @@
+"""
+Standalone PEAK access logic for trackers.
+
+This module imports nothing from Archipelago or the rest of the world package, so trackers can load the file on its
+own. Its requirements are the ones Rules.py applies, passed in either as LOCATION_RULES directly or through the
+location index written by tools/export_location_index.py.
+"""
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+# An (item, count) pair that must be held, or None for no requirement, exactly as in Rules.py
+Requirement = Optional[Tuple[str, int]]
+
+
+class PeakTrackerLogic:
+    """
+    Bulk location access for one PEAK slot.
+
+    Every distinct requirement gets one bit, and locations are grouped by the bit they need, so a query is one count
+    check per requirement and one mask test per group. Results are cached by the mask of satisfied requirements,
+    which only takes a few dozen distinct values over a whole game.
+
+    Events (Ascent N Completed, Mesa Access, ...) are resolved automatically: an event whose own requirement is met
+    counts as held, just like the locked event items placed during generation.
+    """
+    __slots__ = ("requirements", "events", "_bits", "_groups", "_event_masks", "_event_grants", "_cache")
+
+    def __init__(self, rules: Mapping[Hashable, Requirement], events: Iterable[str] = ()):
+        self.events: FrozenSet[str] = frozenset(event for event in events if event in rules)
+        self.requirements: Tuple[Tuple[str, int], ...] = tuple(
+            dict.fromkeys(requirement for requirement in rules.values() if requirement is not None)
+        )
+        self._bits: Dict[Tuple[str, int], int] = {requirement: 1 << i for i, requirement in enumerate(self.requirements)}
+
+        groups: Dict[int, List[Hashable]] = {}
+        for location, requirement in rules.items():
+            if location not in self.events:
+                groups.setdefault(self._mask(requirement), []).append(location)
+        self._groups: Tuple[Tuple[int, FrozenSet[Hashable]], ...] = tuple(
+            (mask, frozenset(locations)) for mask, locations in groups.items()
+        )
+
+        # Each event's own requirement, and the requirement bits that holding the event satisfies
+        self._event_masks: Tuple[Tuple[str, int], ...] = tuple((event, self._mask(rules[event])) for event in self.events)
+        self._event_grants: Dict[str, int] = {
+            event: sum(bit for (item, count), bit in self._bits.items() if item == event and count <= 1)
+            for event in self.events
+        }
+        self._cache: Dict[int, FrozenSet[Hashable]] = {}
+
+    @classmethod
+    def from_index(cls, index: Mapping[str, Any], ascent_cutoff: int = 7) -> "PeakTrackerLogic":
+        """
+        Build from an exported location index, keyed by integer location id.
+
+        ascent_cutoff is the slot's highest included ascent: its ascent_count for the Reach Peak goal, 7 otherwise.
+        """
+        fields = index["fields"]
+        ascent, requirement = fields.index("ascent"), fields.index("requirement")
+        rules: Dict[Hashable, Requirement] = {
+            int(code): _requirement(row[requirement])
+            for code, row in index["locations"].items() if row[ascent] <= ascent_cutoff
+        }
+        events = [name for name, event in index["events"].items() if event["ascent"] <= ascent_cutoff]
+        rules.update((name, _requirement(index["events"][name]["requirement"])) for name in events)
+        return cls(rules, events)
+
+    def _mask(self, requirement: Requirement) -> int:
+        return 0 if requirement is None else self._bits[requirement]
+
+    def satisfied_mask(self, items: Mapping[str, int]) -> int:
+        """Mask of the requirements met by received item counts, after resolving events."""
+        satisfied = 0
+        for requirement, bit in self._bits.items():
+            item, count = requirement
+            if items.get(item, 0) >= count:
+                satisfied |= bit
+
+        # Events unlock each other in short chains, so repeat until nothing new is held
+        held = set()
+        changed = True
+        while changed:
+            changed = False
+            for event, mask in self._event_masks:
+                if event not in held and not mask & ~satisfied:
+                    held.add(event)
+                    satisfied |= self._event_grants[event]
+                    changed = True
+        return satisfied
+
+    def accessible_events(self, items: Mapping[str, int]) -> FrozenSet[str]:
+        satisfied = self.satisfied_mask(items)
+        return frozenset(event for event, mask in self._event_masks if not mask & ~satisfied)
+
+    def accessible_locations(self, items: Mapping[str, int]) -> FrozenSet[Hashable]:
+        """Every non-event location reachable with the given received item counts."""
+        satisfied = self.satisfied_mask(items)
+        accessible = self._cache.get(satisfied)
+        if accessible is None:
+            accessible = frozenset().union(*(locations for mask, locations in self._groups if not mask & ~satisfied))
+            self._cache[satisfied] = accessible
+        return accessible
+
+
+def _requirement(value: Optional[List[Any]]) -> Requirement:
+    return None if value is None else (value[0], value[1])
@@ -1,14 +1,15 @@
-import logging
-import math
 from collections import Counter
+from random import Random
 import typing
 
-from BaseClasses import ItemClassification, CollectionState, LocationProgressType
+from BaseClasses import Item, ItemClassification, CollectionState, MultiWorld
 from worlds.AutoWorld import World, WebWorld
-from .Items import PeakItem, item_table, progression_table, useful_table, filler_table, trap_table, lookup_id_to_name, item_groups
-from .Locations import LOCATION_TABLE, EXCLUDED_LOCATIONS
-from .Options import PeakOptions, peak_option_groups
-from .Rules import apply_rules
+from .Items import PeakItem, item_table, filler_table, item_groups, create_items_from_counts
+from .Locations import LOCATION_TABLE, EVENT_LOCATIONS
+from .Options import PeakOptions, peak_option_groups, trap_registry
+from .Rules import apply_rules, update_logic_cache, HasRule
+from .SlotData import legacy_slot_data, compact_slot_data
+from .GenerationLog import GenerationLog
 
 class PeakWeb(WebWorld):
     theme = "stone"
@@ -21,34 +22,37 @@ class PeakWorld(World):
     game = "PEAK"
     options_dataclass = PeakOptions
     options: PeakOptions
-    topology_present = False
+    topology_present = True
+    # Raise instead of generating when the item pool does not exactly fill this slot's locations
+    strict_pool_check: typing.ClassVar[bool] = False
 
     item_name_groups = item_groups
     item_name_to_id = {name: data.code for name, data in item_table.items()}
-    location_name_to_id = LOCATION_TABLE.copy()
-    
-    # Add event locations to the mapping
-    event_locations = [
-        "Ascent 1 Completed",
-        "Ascent 2 Completed",
-        "Ascent 3 Completed",
-        "Ascent 4 Completed",
-        "Ascent 5 Completed",
-        "Ascent 6 Completed",
-        "Ascent 7 Completed",
-        "Mesa Access",
-        "Alpine Access",
-        "Roots Access",
-        "Idol Dunked",
-        "All Badges Collected"
-
-    ]
-    for event_loc in event_locations:
-        location_name_to_id[event_loc] = None
+    # Event locations have no numeric ID
+    location_name_to_id = {**LOCATION_TABLE, **dict.fromkeys(EVENT_LOCATIONS)}
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.excluded_locations = set()
+        self.slot_plan = None
+        self.region_template = None
+        self.peak_entrances = []
+
+    def generate_early(self):
+        self.log = GenerationLog(self)
+
+        # One RNG stream per generation stage, all derived from this slot's seed up front, so an option that changes
+        # how much one stage draws leaves every other stage (and every other slot) drawing exactly the same values
+        stream_seed = self.random.getrandbits(64)
+        self.trap_random = Random(f"{stream_seed}:traps")
+        self.filler_random = Random(f"{stream_seed}:filler")
+        self.extra_filler_random = Random(f"{stream_seed}:extra_filler")
+
+    @classmethod
+    def stage_generate_early(cls, multiworld: MultiWorld):
+        """Plan regions and items once per distinct set of options, shared by every PEAK slot that uses it."""
+        from .Plans import assign_slot_plans
+        assign_slot_plans([multiworld.worlds[player] for player in multiworld.get_game_players(cls.game)])
 
     def validate_ids(self):
         """Ensure that item and location IDs are unique."""
@@ -82,153 +86,48 @@ class PeakWorld(World):
         return PeakItem(name, classification, data.code, self.player)
 
     def create_items(self):
-        """Create the initial item pool based on the location table."""
-        
-        # Calculate total locations, accounting for excluded ascent levels
-        goal_type = self.options.goal.value
-        required_ascent = self.options.ascent_count.value
-        
-        # Start with all locations in LOCATION_TABLE
-        total_locations = len(LOCATION_TABLE)
-        
-        # Add event locations
-        total_locations += 12  # 7 Ascent Completed + Mesa/Roots/Alpine Access + Idol Dunked + All Badges Collected
-        
-        # Subtract excluded ascent locations if goal is Reach Peak
-        if goal_type == 0:  # Reach Peak goal
-            excluded_ascent_count = 7 - required_ascent  # Number of ascents to exclude
-            # Each excluded ascent has 6 badge locations (Beachcomber, Trailblazer, Alpinist, Volcanology, Nomad, Forestry)
-            # Plus 1 Scout Sashe location
-            # Plus 1 Ascent Completed event
-            locations_per_ascent = 6 + 1 + 1  # 8 total
-            total_locations -= (excluded_ascent_count * locations_per_ascent)
-            
-            logging.debug(f"[Player {self.multiworld.player_name[self.player]}] Excluding {excluded_ascent_count} ascent levels, removing {excluded_ascent_count * locations_per_ascent} locations")
-        
-        logging.debug(f"[Player {self.multiworld.player_name[self.player]}] Total locations after exclusions: {total_locations}")
-        
-        item_pool = []
-        
-        # Add Progressive Ascent items based on goal requirements
-        if goal_type == 0:  # Reach Peak goal - only add enough Progressive Ascent for the required level
-            for _ in range(required_ascent):
-                item_pool.append(self.create_item("Progressive Ascent"))
-            logging.debug(f"[Player {self.multiworld.player_name[self.player]}] Added {required_ascent} Progressive Ascent items (Reach Peak goal)")
-        else:  # Other goals - add all 7 Progressive Ascent items
-            for _ in range(7):
-                item_pool.append(self.create_item("Progressive Ascent"))
-            logging.debug(f"[Player {self.multiworld.player_name[self.player]}] Added 7 Progressive Ascent items (non-Reach Peak goal)")
-        
-        
-        # Add progressive stamina items if enabled
-        if self.options.progressive_stamina.value:
-            max_stamina_upgrades = 4
-            if self.options.additional_stamina_bars.value:
-                max_stamina_upgrades = 7
-            
-            for i in range(max_stamina_upgrades):
-                item_pool.append(self.create_item("Progressive Stamina Bar"))
-            
-            logging.debug(f"[Player {self.multiworld.player_name[self.player]}] Added {max_stamina_upgrades} progressive stamina items")
-
-        # Add useful items
-        for item_name in useful_table.keys():
-            if item_name != "Progressive Stamina Bar":  # Skip stamina bar since we handled it above
-                item_pool.append(self.create_item(item_name))
-        
-        # Calculate how many slots are left for traps and fillers
-        remaining_slots = total_locations - len(item_pool)
-        
-        # Build trap_weights list based on individual trap weights
-        trap_weights = []
-        trap_weights += (["Instant Death Trap"] * self.options.instant_death_trap_weight.value)
-        trap_weights += (["Items to Bombs"] * self.options.items_to_bombs_weight.value)
-        trap_weights += (["Pokemon Trivia Trap"] * self.options.pokemon_trivia_trap_weight.value)
-        trap_weights += (["Blackout Trap"] * self.options.blackout_trap_weight.value)
-        trap_weights += (["Spawn Bee Swarm"] * self.options.spawn_bee_swarm_weight.value)
-        trap_weights += (["Banana Peel Trap"] * self.options.banana_peel_trap_weight.value)
-        trap_weights += (["Minor Poison Trap"] * self.options.minor_poison_trap_weight.value)
-        trap_weights += (["Poison Trap"] * self.options.poison_trap_weight.value)
-        trap_weights += (["Deadly Poison Trap"] * self.options.deadly_poison_trap_weight.value)
-        trap_weights += (["Tornado Trap"] * self.options.tornado_trap_weight.value)
-        trap_weights += (["Swap Trap"] * self.options.swap_trap_weight.value)
-        trap_weights += (["Nap Time Trap"] * self.options.nap_time_trap_weight.value)
-        trap_weights += (["Hungry Hungry Camper Trap"] * self.options.hungry_hungry_camper_trap_weight.value)
-        trap_weights += (["Balloon Trap"] * self.options.balloon_trap_weight.value)
-        trap_weights += (["Slip Trap"] * self.options.slip_trap_weight.value)
-        trap_weights += (["Freeze Trap"] * self.options.freeze_trap_weight.value)
-        trap_weights += (["Cold Trap"] * self.options.cold_trap_weight.value)
-        trap_weights += (["Hot Trap"] * self.options.hot_trap_weight.value)
-        trap_weights += (["Injury Trap"] * self.options.injury_trap_weight.value)
-        trap_weights += (["Cactus Ball Trap"] * self.options.cactus_ball_trap_weight.value)
-        trap_weights += (["Yeet Trap"] * self.options.yeet_trap_weight.value)
-        trap_weights += (["Tumbleweed Trap"] * self.options.tumbleweed_trap_weight.value)
-        trap_weights += (["Zombie Horde Trap"] * self.options.zombie_horde_trap_weight.value)
-        trap_weights += (["Gust Trap"] * self.options.gust_trap_weight.value)
-        trap_weights += (["Mandrake Trap"] * self.options.mandrake_trap_weight.value)
-        trap_weights += (["Fungal Infection Trap"] * self.options.fungal_infection_trap_weight.value)
-        trap_weights += (["Fear Trap"] * self.options.fear_trap_weight.value)
-        trap_weights += (["Scoutmaster Trap"] * self.options.scoutmaster_trap_weight.value)
-        
-        # Calculate number of trap items based on TrapPercentage
-        trap_count = 0 if (len(trap_weights) == 0) else math.ceil(remaining_slots * (self.options.trap_percentage.value / 100.0))
-        
-        # Add trap items by randomly selecting from weighted list
-        trap_pool = []
-        for i in range(trap_count):
-            trap_item = self.multiworld.random.choice(trap_weights)
-            trap_pool.append(self.create_item(trap_item))
-        
-        item_pool += trap_pool
-        
-        # Fill remaining slots with filler items
-        filler_items = list(filler_table.keys())
-        while len(item_pool) < total_locations:
-            filler_name = self.random.choice(filler_items)
-            item_pool.append(self.create_item(filler_name))
-        
-        logging.debug(f"[Player {self.multiworld.player_name[self.player]}] Total item pool count: {len(item_pool)}")
-        logging.debug(f"[Player {self.multiworld.player_name[self.player]}] Total locations: {total_locations}")
-        logging.debug(f"[Player {self.multiworld.player_name[self.player]}] Trap items added: {trap_count}")
+        """Create the initial item pool from this slot's plan."""
+        
+        plan = self.slot_plan
+        total_locations = plan.total_locations
+        
+        self.log.debug("Total locations after exclusions: %s", total_locations)
+        self.log.debug("Added %s Progressive Ascent items", plan.fixed_counts["Progressive Ascent"])
+        self.log.debug("Added %s progressive stamina items", plan.fixed_counts.get("Progressive Stamina Bar", 0))
+        
+        item_counts: typing.Counter[str] = Counter(plan.fixed_counts)
+        
+        # Draw all traps, then all filler for the remaining slots, in one weighted multi-sample call each
+        trap_count = plan.trap_count
+        if trap_count:
+            item_counts.update(plan.trap_sampler.sample(self.trap_random, trap_count))
+        if plan.filler_count > 0:
+            item_counts.update(self.filler_random.choices(list(filler_table.keys()), k=plan.filler_count))
+        
+        item_pool = create_items_from_counts(item_counts, self.player)
+        
+        self.log.record("item_pool", len(item_pool))
+        self.log.record("traps", trap_count)
+        self.log.debug("Total item pool count: %s", len(item_pool))
+        self.log.debug("Total locations: %s", total_locations)
+        self.log.debug("Trap items added: %s", trap_count)
+        
+        if self.strict_pool_check:
+            # Count what create_regions actually made, not the template the lookup table was built from
+            created_locations = sum(loc.address is not None for loc in self.multiworld.get_locations(self.player))
+            if not len(item_pool) == total_locations == created_locations:
+                raise Exception(
+                    f"PEAK item pool mismatch for {self.player_name}: {len(item_pool)} items, "
+                    f"{total_locations} locations expected, {created_locations} created"
+                )
         
         self.multiworld.itempool.extend(item_pool)
     
     def output_active_traps(self) -> typing.Dict[str, int]:
-        trap_data = {}
-
-        trap_data["instant_death_trap"] = self.options.instant_death_trap_weight.value
-        trap_data["items_to_bombs"] = self.options.items_to_bombs_weight.value
-        trap_data["pokemon_trivia_trap"] = self.options.pokemon_trivia_trap_weight.value
-        trap_data["blackout_trap"] = self.options.blackout_trap_weight.value
-        trap_data["spawn_bee_swarm"] = self.options.spawn_bee_swarm_weight.value
-        trap_data["banana_peel_trap"] = self.options.banana_peel_trap_weight.value
-        trap_data["minor_poison_trap"] = self.options.minor_poison_trap_weight.value
-        trap_data["poison_trap"] = self.options.poison_trap_weight.value
-        trap_data["deadly_poison_trap"] = self.options.deadly_poison_trap_weight.value
-        trap_data["tornado_trap"] = self.options.tornado_trap_weight.value
-        trap_data["swap_trap"] = self.options.swap_trap_weight.value
-        trap_data["nap_time_trap"] = self.options.nap_time_trap_weight.value
-        trap_data["hungry_hungry_camper_trap"] = self.options.hungry_hungry_camper_trap_weight.value
-        trap_data["balloon_trap"] = self.options.balloon_trap_weight.value
-        trap_data["slip_trap"] = self.options.slip_trap_weight.value
-        trap_data["freeze_trap"] = self.options.freeze_trap_weight.value
-        trap_data["cold_trap"] = self.options.cold_trap_weight.value
-        trap_data["hot_trap"] = self.options.hot_trap_weight.value
-        trap_data["injury_trap"] = self.options.injury_trap_weight.value
-        trap_data["cactus_ball_trap"] = self.options.cactus_ball_trap_weight.value
-        trap_data["yeet_trap"] = self.options.yeet_trap_weight.value
-        trap_data["tumbleweed_trap"] = self.options.tumbleweed_trap_weight.value
-        trap_data["zombie_horde_trap"] = self.options.zombie_horde_trap_weight.value
-        trap_data["gust_trap"] = self.options.gust_trap_weight.value
-        trap_data["mandrake_trap"] = self.options.mandrake_trap_weight.value
-        trap_data["fungal_infection_trap"] = self.options.fungal_infection_trap_weight.value
-        trap_data["fear_trap"] = self.options.fear_trap_weight.value
-        trap_data["scoutmaster_trap"] = self.options.scoutmaster_trap_weight.value
-
-        return trap_data
+        return {trap.slot_key: getattr(self.options, trap.option_name).value for trap in trap_registry}
 
     def set_rules(self):
-        """Set progression rules and top-up the item pool based on final locations."""
+        """Set progression rules and the completion condition."""
 
         apply_rules(self)
 
@@ -239,67 +138,48 @@ class PeakWorld(World):
         # Set completion condition based on goal type
         if goal == 0:  # Reach Peak
             if 1 <= ascent_num <= 7:
-                self.multiworld.completion_condition[self.player] = (
-                    lambda state, n=ascent_num: state.has(f"Ascent {n} Completed", self.player)
-                )
+                self.multiworld.completion_condition[self.player] = HasRule(
+                    self.player, f"Ascent {ascent_num} Completed"
+                ).test
             else:
                 return  # Invalid ascent count, exit early
 
         elif goal == 1:  # Complete All Badges
-            self.multiworld.completion_condition[self.player] = (
-                lambda state: state.has("All Badges Collected", self.player)
-            )
+            self.multiworld.completion_condition[self.player] = HasRule(self.player, "All Badges Collected").test
 
         elif goal == 2:  # 24 Karat Badge
-            self.multiworld.completion_condition[self.player] = (
-                lambda state: state.has("Idol Dunked", self.player)
-            )
+            self.multiworld.completion_condition[self.player] = HasRule(self.player, "Idol Dunked").test
 
         else:
             return  # Unsupported goal type, exit early
 
-        # Ensure item pool matches number of locations
-        final_locations = [loc for loc in self.multiworld.get_locations() if loc.player == self.player]
-        current_items = [item for item in self.multiworld.itempool if item.player == self.player]
-        missing = len(final_locations) - len(current_items)
-
-        if missing > 0:
-            logging.debug(
-                f"[Player {self.multiworld.player_name[self.player]}] "
-                f"Item pool is short by {missing} items. Adding filler items."
-            )
-            for _ in range(missing):
-                filler_name = self.get_filler_item_name()
-                self.multiworld.itempool.append(self.create_item(filler_name))
-
     def fill_slot_data(self):
         """Return slot data for this player."""
-        session_id = f"{self.multiworld.seed_name}_{self.player}"
-        slot_data = {
-            "goal": self.options.goal.value,
-            "ascent_count": self.options.ascent_count.value,
-            "badge_count": self.options.badge_count.value,
-            "progressive_stamina": self.options.progressive_stamina.value,
-            "additional_stamina_bars": self.options.additional_stamina_bars.value,
-            "trap_percentage": self.options.trap_percentage.value,
-            "ring_link": self.options.ring_link.value,
-            "hard_ring_link": self.options.hard_ring_link.value,
-            "energy_link": self.options.energy_link.value,
-            "trap_link": self.options.trap_link.value,
-            "death_link": self.options.death_link.value,
-            "death_link_behavior": self.options.death_link_behavior.value,
-            "death_link_send_behavior": self.options.death_link_send_behavior.value,
-            "active_traps": self.output_active_traps(),
-            "session_id": session_id,
-        }
+        if self.options.compact_slot_data:
+            slot_data = compact_slot_data(self)
+        else:
+            slot_data = legacy_slot_data(self)
         
-        # Log what we're sending
-        logging.info(f"[Player {self.multiworld.player_name[self.player]}] Slot data being sent: {slot_data}")
+        # Log what we're sending, then this slot's generation summary
+        self.log.debug("Slot data being sent: %s", slot_data)
+        self.log.flush()
         
         return slot_data
 
+    def collect(self, state: CollectionState, item: Item) -> bool:
+        change = super().collect(state, item)
+        if change:
+            update_logic_cache(state, self.player, item.name)
+        return change
+
+    def remove(self, state: CollectionState, item: Item) -> bool:
+        change = super().remove(state, item)
+        if change:
+            update_logic_cache(state, self.player, item.name)
+        return change
+
     def get_filler_item_name(self):
         """Randomly select a filler item from the available candidates."""
         if not filler_table:
             raise Exception("No filler items available in item_table.")
-        return self.random.choice(list(filler_table.keys()))
\ No newline at end of file
+        return self.extra_filler_random.choice(list(filler_table.keys()))
\ No newline at end of file
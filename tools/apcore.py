@@ -0,0 +1,112 @@
+"""
+Helpers for driving the PEAK world against a local Archipelago core checkout.
+
+The tools in this directory run fully offline. Point them at a checkout of the
+Archipelago repository (``--archipelago PATH`` or the ``ARCHIPELAGO_PATH``
+environment variable) at the pinned release below. The PEAK world is loaded
+from this repository's ``peak`` folder, so the checkout itself must not contain
+another PEAK world.
+"""
+import argparse
+import importlib
+import os
+import sys
+from argparse import Namespace
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+# Archipelago release the tools are pinned to; matches minimum_ap_version in peak/archipelago.json
+PINNED_ARCHIPELAGO_VERSION = "0.6.4"
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Generation steps run before the fill, in the order Archipelago's Main runs them
+GEN_STEPS = (
+    "generate_early",
+    "create_regions",
+    "create_items",
+    "set_rules",
+    "connect_entrances",
+    "generate_basic",
+    "pre_fill",
+)
+
+
+def add_archipelago_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--archipelago", default=os.environ.get("ARCHIPELAGO_PATH"),
+                        help="Path to an Archipelago core checkout (default: $ARCHIPELAGO_PATH)")
+    parser.add_argument("--allow-unpinned", action="store_true",
+                        help=f"Run against a checkout that is not Archipelago {PINNED_ARCHIPELAGO_VERSION}")
+
+
+def add_checkout_to_path(path: Optional[str], allow_unpinned: bool = False) -> None:
+    """Put the Archipelago checkout on sys.path after checking it is the pinned release."""
+    if not path:
+        raise SystemExit("No Archipelago checkout given; pass --archipelago or set ARCHIPELAGO_PATH")
+    checkout = Path(path).resolve()
+    if not (checkout / "BaseClasses.py").is_file():
+        raise SystemExit(f"{checkout} does not look like an Archipelago checkout")
+    if str(checkout) not in sys.path:
+        sys.path.insert(0, str(checkout))
+
+    import Utils
+    if Utils.__version__ != PINNED_ARCHIPELAGO_VERSION and not allow_unpinned:
+        raise SystemExit(f"Archipelago checkout is {Utils.__version__}, tools are pinned to "
+                         f"{PINNED_ARCHIPELAGO_VERSION} (use --allow-unpinned to override)")
+
+
+def load_archipelago(path: Optional[str], allow_unpinned: bool = False):
+    """Put the Archipelago checkout on sys.path, register the PEAK world and return PeakWorld."""
+    add_checkout_to_path(path, allow_unpinned)
+    import worlds
+    from worlds.AutoWorld import AutoWorldRegister
+    existing = AutoWorldRegister.world_types.get("PEAK")
+    if existing is not None and Path(sys.modules[existing.__module__].__file__).resolve().parent != REPO_ROOT / "peak":
+        raise SystemExit(f"The checkout already provides a PEAK world ({existing.__module__}); remove it first")
+    if existing is None:
+        worlds.__path__.append(str(REPO_ROOT))
+        importlib.import_module("worlds.peak")
+    return AutoWorldRegister.world_types["PEAK"]
+
+
+def build_multiworld(players: int, options: Sequence[Mapping[str, Any]] | Mapping[str, Any] = (),
+                     seed: Optional[int] = None):
+    """
+    Create an unfilled MultiWorld of PEAK slots without running any generation step.
+
+    options is either one mapping of option overrides applied to every slot, or one mapping per slot.
+    """
+    from BaseClasses import CollectionState, MultiWorld
+    from worlds.AutoWorld import AutoWorldRegister
+
+    world_type = AutoWorldRegister.world_types["PEAK"]
+    if isinstance(options, Mapping):
+        options = [options] * players
+    elif not options:
+        options = [{}] * players
+
+    multiworld = MultiWorld(players)
+    multiworld.game = {player: world_type.game for player in multiworld.player_ids}
+    multiworld.player_name = {player: f"Peak{player}" for player in multiworld.player_ids}
+    multiworld.set_seed(seed)
+
+    args = Namespace()
+    for name, option in world_type.options_dataclass.type_hints.items():
+        values: Dict[int, Any] = {}
+        for player, overrides in zip(multiworld.player_ids, options):
+            values[player] = option.from_any(overrides.get(name, option.default))
+        setattr(args, name, values)
+    multiworld.set_options(args)
+    multiworld.state = CollectionState(multiworld)
+    return multiworld
+
+
+def run_step(multiworld, step: str) -> None:
+    from worlds.AutoWorld import call_all
+    call_all(multiworld, step)
+
+
+def run_fill(multiworld) -> None:
+    from Fill import distribute_items_restrictive
+    distribute_items_restrictive(multiworld)
+    run_step(multiworld, "post_fill")
@@ -0,0 +1,110 @@
+"""
+Generation benchmark for the PEAK world.
+
+Drives PEAK-only multiworlds through every generation step, a full fill and
+fill_slot_data, and reports per-stage wall time, peak traced memory and net
+allocated blocks. By default it covers 1, 10, 50 and 200 slots for every
+Goal / AscentCount combination.
+
+    python tools/bench_generation.py --archipelago ../Archipelago
+    python tools/bench_generation.py --slots 50 --goals 0 --ascents 4 --json bench.json
+
+Wall times come from the fastest of --repeat untraced runs. Memory figures come
+from one extra run under tracemalloc, so tracing overhead does not skew the timings.
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict
+
+from apcore import GEN_STEPS, add_archipelago_arguments, build_multiworld, load_archipelago, run_fill, run_step
+
+def run_once(slots: int, options: Dict[str, int], seed: int, traced: bool) -> Dict[str, Dict[str, float]]:
+    """Generate one multiworld and measure each stage."""
+    results: Dict[str, Dict[str, float]] = {}
+    gc.collect()
+    if traced:
+        tracemalloc.start()
+
+    multiworld = None
+
+    def setup() -> None:
+        nonlocal multiworld
+        multiworld = build_multiworld(slots, options, seed)
+
+    stages = [("setup", setup)]
+    stages += [(step, lambda step=step: run_step(multiworld, step)) for step in GEN_STEPS]
+    stages.append(("fill", lambda: run_fill(multiworld)))
+    stages.append(("fill_slot_data", lambda: [world.fill_slot_data() for world in multiworld.worlds.values()]))
+
+    for stage, call in stages:
+        if traced:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        call()
+        stage_result = {"seconds": time.perf_counter() - start, "blocks": sys.getallocatedblocks() - blocks}
+        if traced:
+            _, peak = tracemalloc.get_traced_memory()
+            stage_result["peak_bytes"] = peak - before
+        results[stage] = stage_result
+
+    if traced:
+        tracemalloc.stop()
+    return results
+
+
+def benchmark(slots: int, goal: int, ascent_count: int, seed: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    options = {"goal": goal, "ascent_count": ascent_count}
+    timings = [run_once(slots, options, seed, traced=False) for _ in range(repeat)]
+    traced = run_once(slots, options, seed, traced=True)
+
+    results = {}
+    for stage in traced:
+        results[stage] = {
+            "seconds": min(run[stage]["seconds"] for run in timings),
+            "blocks": traced[stage]["blocks"],
+            "peak_bytes": traced[stage].get("peak_bytes", 0),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_archipelago_arguments(parser)
+    parser.add_argument("--slots", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--goals", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--ascents", type=int, nargs="+", default=list(range(8)))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="Untraced runs per case; the fastest is reported")
+    parser.add_argument("--json", type=Path, help="Also write all results to this file")
+    args = parser.parse_args()
+
+    json_path = args.json.resolve() if args.json else None
+    load_archipelago(args.archipelago, args.allow_unpinned)
+
+    report = []
+    for slots in args.slots:
+        for goal in args.goals:
+            for ascent_count in args.ascents:
+                results = benchmark(slots, goal, ascent_count, args.seed, args.repeat)
+                report.append({"slots": slots, "goal": goal, "ascent_count": ascent_count, "stages": results})
+
+                total = sum(stage["seconds"] for stage in results.values())
+                print(f"slots={slots:<4} goal={goal} ascent_count={ascent_count}  total {total * 1000:9.1f} ms")
+                for stage, stage_result in results.items():
+                    print(f"    {stage:<18} {stage_result['seconds'] * 1000:9.2f} ms"
+                          f"  peak {stage_result['peak_bytes'] / 1024:9.1f} KiB"
+                          f"  blocks {stage_result['blocks']:+8d}")
+
+    if json_path:
+        json_path.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Import time of the PEAK world.
+
+Each repeat runs in a fresh interpreter that first imports Archipelago's core
+modules, then imports worlds.peak under -X importtime, so only the world's
+own modules are measured. Exits non-zero when the median import time is over
+--budget-ms, so the budget can guard CI.
+
+    python tools/bench_import.py --archipelago ../Archipelago --repeat 15
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from apcore import add_archipelago_arguments
+
+# Median import time of worlds.peak the world is expected to stay under
+DEFAULT_BUDGET_MS = 25.0
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {tools!r})
+from apcore import REPO_ROOT, add_checkout_to_path
+add_checkout_to_path({archipelago!r}, {allow_unpinned!r})
+import logging, re, BaseClasses, Options, worlds, worlds.AutoWorld  # Already loaded by Archipelago's own startup
+worlds.__path__.append(str(REPO_ROOT))
+start = time.perf_counter()
+import worlds.peak  # An import statement, so -X importtime reports the package itself too
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+def import_once(archipelago: str, allow_unpinned: bool) -> Tuple[float, Dict[str, int]]:
+    """Seconds to import worlds.peak, and the self time in microseconds of each of its modules."""
+    code = CHILD.format(tools=str(Path(__file__).resolve().parent), archipelago=archipelago,
+                        allow_unpinned=allow_unpinned)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    if result.returncode:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise SystemExit("Importing worlds.peak failed:\n" + "\n".join(errors))
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if name.startswith("worlds.peak") and self_us.isdigit():
+            modules[name] = int(self_us)
+    return json.loads(result.stdout), modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_archipelago_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    archipelago = str(Path(args.archipelago).resolve()) if args.archipelago else None
+
+    timings: List[float] = []
+    module_times: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(args.repeat):
+        seconds, modules = import_once(archipelago, args.allow_unpinned)
+        timings.append(seconds * 1000)
+        for name, micros in modules.items():
+            module_times[name].append(micros)
+
+    median = statistics.median(timings)
+    modules = {name: statistics.median(times) / 1000 for name, times in module_times.items()}
+    if args.json:
+        print(json.dumps({"median_ms": median, "min_ms": min(timings), "budget_ms": args.budget_ms,
+                          "modules_ms": modules}, indent=2))
+    else:
+        for name, millis in sorted(modules.items(), key=lambda item: -item[1]):
+            print(f"  {name:<28} {millis:7.2f} ms self")
+        print(f"import worlds.peak: median {median:.2f} ms, min {min(timings):.2f} ms "
+              f"(budget {args.budget_ms:.1f} ms)")
+    if median > args.budget_ms:
+        raise SystemExit(f"Import time {median:.2f} ms is over the {args.budget_ms:.1f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
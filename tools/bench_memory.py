@@ -0,0 +1,71 @@
+"""
+Per-instance memory of PEAK items and locations.
+
+Compares PeakItem and PeakLocation against otherwise identical subclasses
+without __slots__, measured with tracemalloc over many instances, the way the
+generator creates them.
+
+    python tools/bench_memory.py --archipelago ../Archipelago
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, List
+
+from apcore import add_archipelago_arguments, load_archipelago
+
+
+def bytes_per_instance(factory: Callable[[int], object], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    instances: List[object] = [factory(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list holding the instances is not part of their cost
+    list_bytes = instances.__sizeof__()
+    del instances
+    return (after - before - list_bytes) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_archipelago_arguments(parser)
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    load_archipelago(args.archipelago, args.allow_unpinned)
+    from BaseClasses import Item, ItemClassification, Location, Region, MultiWorld
+    from worlds.peak.Items import PeakItem
+    from worlds.peak.Locations import PeakLocation
+
+    UnslottedPeakItem = type("UnslottedPeakItem", (Item,), {"game": "PEAK"})
+    UnslottedPeakLocation = type("UnslottedPeakLocation", (Location,), {"game": "PEAK"})
+    region = Region("Mountain", 1, MultiWorld(1))
+    rule = lambda state: True
+
+    def location_factory(location_type):
+        def factory(i: int):
+            location = location_type(1, f"Location {i}", 76100 + i, region)
+            location.access_rule = rule
+            return location
+        return factory
+
+    rows = [
+        ("PeakItem", lambda i: PeakItem(f"Item {i}", ItemClassification.filler, 77000 + i, 1),
+         lambda i: UnslottedPeakItem(f"Item {i}", ItemClassification.filler, 77000 + i, 1)),
+        ("PeakLocation", location_factory(PeakLocation), location_factory(UnslottedPeakLocation)),
+    ]
+    import Utils
+    print(f"Archipelago core {Utils.__version__}")
+    print(f"{'class':<14} {'slotted':>10} {'unslotted':>10} {'saved':>10}   (bytes per instance, n={args.count})")
+    for name, slotted, unslotted in rows:
+        with_slots = bytes_per_instance(slotted, args.count)
+        without_slots = bytes_per_instance(unslotted, args.count)
+        print(f"{name:<14} {with_slots:>10.1f} {without_slots:>10.1f} {without_slots - with_slots:>10.1f}")
+    if hasattr(PeakLocation(1, "probe", None, region), "__dict__"):
+        print("Location is not slotted in this Archipelago core, so PeakLocation instances still carry a __dict__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Pickle round trip of the PEAK-owned parts of a generated multiworld.
+
+Generates and fills a multiworld, then pickles and unpickles what the PEAK
+world contributes to it: every location's and entrance's name, address,
+regions and access rule, and each slot's completion condition. Core objects
+(MultiWorld, Region, Location) are not pickled; whether those survive is up to
+Archipelago core. The unpickled copy must match the original layout, and every
+copied rule must give the same answer as the original on each state of a
+sphere-by-sphere playthrough. Exits non-zero on any difference.
+
+    python tools/check_pickle.py --archipelago ../Archipelago --slots 24
+"""
+import argparse
+import itertools
+import pickle
+import time
+from typing import Any, Dict, List
+
+from apcore import GEN_STEPS, add_archipelago_arguments, build_multiworld, load_archipelago, run_fill, run_step
+
+
+def own_rule(spot):
+    """The access rule the PEAK world set on a location or entrance, or None where the core default still applies."""
+    rule = spot.access_rule
+    return None if rule is type(spot).access_rule else rule
+
+
+def peak_snapshot(multiworld) -> Dict[int, Dict[str, Any]]:
+    """Per slot, the layout and rules the PEAK world built, without the core objects that hold them."""
+    snapshot = {}
+    for player in multiworld.player_ids:
+        snapshot[player] = {
+            "locations": [(loc.name, loc.address, loc.parent_region.name, own_rule(loc))
+                          for loc in multiworld.get_locations(player)],
+            "entrances": [(entrance.name, entrance.parent_region.name, entrance.connected_region.name,
+                           own_rule(entrance))
+                          for region in multiworld.get_regions(player) for entrance in region.exits],
+            "completion": multiworld.completion_condition[player],
+        }
+    return snapshot
+
+
+def layout(snapshot: Dict[int, Dict[str, Any]]) -> list:
+    return [(player, [spot[:-1] for spot in slot["locations"]], [spot[:-1] for spot in slot["entrances"]])
+            for player, slot in snapshot.items()]
+
+
+def rules(snapshot: Dict[int, Dict[str, Any]]) -> list:
+    return [rule for slot in snapshot.values()
+            for rule in itertools.chain((spot[-1] for spot in slot["locations"]),
+                                        (spot[-1] for spot in slot["entrances"]), (slot["completion"],))
+            if rule is not None]
+
+
+def playthrough_states(multiworld) -> list:
+    """The empty state, then the state after each sphere of a playthrough."""
+    from BaseClasses import CollectionState
+
+    state = CollectionState(multiworld)
+    states = [state.copy()]
+    remaining = [loc for loc in multiworld.get_locations() if loc.item is not None]
+    while remaining:
+        sphere = [loc for loc in remaining if loc.can_reach(state)]
+        if not sphere:
+            break
+        for loc in sphere:
+            state.collect(loc.item, True, loc)
+        states.append(state.copy())
+        in_sphere = set(map(id, sphere))
+        remaining = [loc for loc in remaining if id(loc) not in in_sphere]
+    return states
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_archipelago_arguments(parser)
+    parser.add_argument("--slots", type=int, default=24, help="PEAK slots; goals and ascent counts are cycled across them")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    load_archipelago(args.archipelago, args.allow_unpinned)
+    goal_ascents = itertools.cycle(itertools.product(range(3), range(1, 8)))
+    options = [{"goal": goal, "ascent_count": ascent_count} for goal, ascent_count in itertools.islice(goal_ascents, args.slots)]
+    multiworld = build_multiworld(args.slots, options, args.seed)
+    for step in GEN_STEPS:
+        run_step(multiworld, step)
+    run_fill(multiworld)
+
+    original = peak_snapshot(multiworld)
+    start = time.perf_counter()
+    try:
+        data = pickle.dumps(original, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as error:
+        raise SystemExit(f"PEAK rules or layout do not pickle: {error}")
+    copy = pickle.loads(data)
+    elapsed = time.perf_counter() - start
+
+    failures: List[str] = []
+    if layout(copy) != layout(original):
+        failures.append("layout")
+    states = playthrough_states(multiworld)
+    pairs = list(zip(rules(original), rules(copy)))
+    if any(rule(state) != copied(state) for state in states for rule, copied in pairs):
+        failures.append("rule results")
+
+    print(f"{args.slots} slots: {len(pairs)} rules, {len(data) / 1024:.0f} KiB pickled, "
+          f"round trip {elapsed * 1000:.0f} ms, checked on {len(states)} playthrough states")
+    if failures:
+        raise SystemExit(f"Unpickled PEAK objects differ in: {', '.join(failures)}")
+    print("Unpickled PEAK rules and layout match the original")
+
+
+if __name__ == "__main__":
+    main()
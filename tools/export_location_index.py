@@ -0,0 +1,51 @@
+"""
+Export the PEAK location hint index as JSON for trackers and the mod.
+
+Each location id maps to one row in the order given by "fields", so clients
+can resolve a location's ascent, biome and badge family with a single lookup
+instead of parsing its name. Rows and events carry the (item, count)
+requirement Rules.py applies, which peak/TrackerLogic.py evaluates without
+Archipelago installed.
+
+    python tools/export_location_index.py --archipelago ../Archipelago -o peak_locations.json
+"""
+import argparse
+import json
+from pathlib import Path
+
+from apcore import REPO_ROOT, add_archipelago_arguments, load_archipelago
+
+
+def build_index() -> dict:
+    from worlds.peak.Locations import LOCATION_HINTS, EVENT_LOCATIONS, LocationHint
+    from worlds.peak.Rules import LOCATION_RULES
+
+    manifest = json.loads((REPO_ROOT / "peak" / "archipelago.json").read_text())
+    return {
+        "game": manifest["game"],
+        "world_version": manifest["version"],
+        "fields": [*LocationHint._fields, "requirement"],
+        "locations": {
+            str(code): [*hint, LOCATION_RULES[hint.name]] for code, hint in sorted(LOCATION_HINTS.items())
+        },
+        "events": {
+            name: {"ascent": data.ascent, "requirement": LOCATION_RULES[name]} for name, data in EVENT_LOCATIONS.items()
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_archipelago_arguments(parser)
+    parser.add_argument("-o", "--output", type=Path, default=Path("peak_locations.json"))
+    args = parser.parse_args()
+    output = args.output.resolve()
+
+    load_archipelago(args.archipelago, args.allow_unpinned)
+    index = build_index()
+    output.write_text(json.dumps(index, separators=(",", ":")))
+    print(f"Wrote {len(index['locations'])} locations to {output}")
+
+
+if __name__ == "__main__":
+    main()
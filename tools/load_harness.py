@@ -0,0 +1,487 @@
+"""
+Local stand-in server and simulated PEAK clients for room capacity planning.
+
+Generates a seed with one PEAK slot per client, starts a stand-in server in
+its own process and connects one simulated client per slot. Each client:
+
+- connects with the link tags its slot data enables
+- sends its slot's location checks in playthrough (sphere) order
+- sends Ring Link / Hard Ring Link amounts, EnergyLink contributions and
+  consumption, and deaths at configurable per-minute rates, batching link
+  changes the way the slot's aggregation interval / minimum delta options ask
+- sends a Trap Link bounce for every trap item it receives, like the mod does
+
+The server relays items, Bounce packets and EnergyLink data storage
+operations. The run reports server message rates, server CPU time, and
+latency percentiles for bounces and data storage replies.
+
+The stand-in server speaks Archipelago's packet shapes: Connect, Connected,
+LocationChecks, ReceivedItems, Bounce/Bounced, Set/SetReply and SetNotify.
+Packets are framed as one JSON list per line over plain TCP rather than
+websockets, so the harness needs nothing beyond the Archipelago checkout.
+Treat the numbers as the cost of the message fan-out itself, not of a real
+MultiServer.
+
+    python tools/load_harness.py --archipelago ../Archipelago --clients 32 --duration 60 --speed 20
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+from apcore import GEN_STEPS, add_archipelago_arguments, build_multiworld, load_archipelago, run_fill, run_step
+
+# Per-client event rates in real minutes of play; --speed compresses them
+DEFAULT_RATES = {
+    "check": 2.0,
+    "ring_link": 6.0,
+    "hard_ring_link": 3.0,
+    "energy_contribute": 2.0,
+    "energy_consume": 0.5,
+    "death": 0.5,
+}
+
+# The mod ignores a second death sent or received within this many seconds
+DEATH_LINK_THROTTLE = 5.0
+
+
+def encode(packets: List[Dict[str, Any]]) -> bytes:
+    return json.dumps(packets, separators=(",", ":")).encode() + b"\n"
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {"count": len(ordered), "p50_ms": at(0.50), "p90_ms": at(0.90), "p99_ms": at(0.99),
+            "max_ms": ordered[-1] * 1000, "mean_ms": statistics.fmean(ordered) * 1000}
+
+
+# --- Seed ---------------------------------------------------------------------------------------------------------
+
+def generate_room(clients: int, seed: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate and fill a PEAK multiworld, and reduce it to what the server and clients need."""
+    from BaseClasses import CollectionState
+    from worlds.peak.Items import trap_table
+
+    multiworld = build_multiworld(clients, options, seed)
+    for step in GEN_STEPS:
+        run_step(multiworld, step)
+    run_fill(multiworld)
+
+    # Playthrough order: every location reachable in a sphere is checked before the next sphere opens
+    rng = random.Random(seed)
+    state = CollectionState(multiworld)
+    remaining = [loc for loc in multiworld.get_locations() if loc.item is not None]
+    checks: Dict[int, List[int]] = {player: [] for player in multiworld.player_ids}
+    while remaining:
+        sphere = [loc for loc in remaining if loc.can_reach(state)]
+        if not sphere:
+            break
+        for loc in sphere:
+            # Without prevent_sweep, core sweeps every reachable advancement on the first collect, counting those
+            # items twice and folding all later spheres into this one
+            state.collect(loc.item, True, loc)
+        sphere_ids = {player: [loc.address for loc in sphere if loc.player == player and loc.address is not None]
+                      for player in multiworld.player_ids}
+        for player, addresses in sphere_ids.items():
+            rng.shuffle(addresses)
+            checks[player].extend(addresses)
+        in_sphere = set(map(id, sphere))
+        remaining = [loc for loc in remaining if id(loc) not in in_sphere]
+
+    placements = {
+        f"{loc.player}:{loc.address}": [loc.item.player, loc.item.code, int(loc.item.classification)]
+        for loc in multiworld.get_locations() if loc.address is not None and loc.item is not None
+    }
+    return {
+        "slot_data": {player: multiworld.worlds[player].fill_slot_data() for player in multiworld.player_ids},
+        "names": {player: multiworld.player_name[player] for player in multiworld.player_ids},
+        "checks": checks,
+        "placements": placements,
+        "trap_ids": sorted(data.code for data in trap_table.values()),
+    }
+
+
+# --- Stand-in server ----------------------------------------------------------------------------------------------
+
+class StandInServer:
+    """Relays PEAK client traffic the way an Archipelago room would, and counts what it handles."""
+
+    def __init__(self, room: Dict[str, Any]):
+        self.slot_data: Dict[int, Dict[str, Any]] = {int(player): data for player, data in room["slot_data"].items()}
+        self.placements: Dict[str, List[int]] = room["placements"]
+        self.clients: Dict[asyncio.StreamWriter, Dict[str, Any]] = {}
+        self.slots: Dict[int, asyncio.StreamWriter] = {}
+        self.received: Dict[int, List[Dict[str, int]]] = defaultdict(list)
+        self.storage: Dict[str, Any] = {}
+        self.notify: Dict[str, Set[asyncio.StreamWriter]] = defaultdict(set)
+        self.packets_in: Counter = Counter()
+        self.packets_out: Counter = Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+
+    def send(self, writer: asyncio.StreamWriter, packets: List[Dict[str, Any]]) -> None:
+        data = encode(packets)
+        self.bytes_out += len(data)
+        for packet in packets:
+            self.packets_out[packet["cmd"]] += 1
+        writer.write(data)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                self.bytes_in += len(line)
+                for packet in json.loads(line):
+                    self.packets_in[packet["cmd"]] += 1
+                    handler = getattr(self, f"on_{packet['cmd']}", None)
+                    if handler is not None:
+                        handler(writer, packet)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            client = self.clients.pop(writer, None)
+            if client is not None:
+                self.slots.pop(client["slot"], None)
+            for watchers in self.notify.values():
+                watchers.discard(writer)
+            writer.close()
+
+    def on_Connect(self, writer: asyncio.StreamWriter, packet: Dict[str, Any]) -> None:
+        slot = packet["slot"]
+        self.clients[writer] = {"slot": slot, "tags": set(packet["tags"])}
+        self.slots[slot] = writer
+        self.send(writer, [
+            {"cmd": "Connected", "team": 0, "slot": slot, "slot_data": self.slot_data[slot]},
+            {"cmd": "ReceivedItems", "index": 0, "items": self.received[slot]},
+        ])
+
+    def on_LocationChecks(self, writer: asyncio.StreamWriter, packet: Dict[str, Any]) -> None:
+        slot = self.clients[writer]["slot"]
+        for location in packet["locations"]:
+            receiver, item, flags = self.placements[f"{slot}:{location}"]
+            entry = {"item": item, "location": location, "player": slot, "flags": flags}
+            index = len(self.received[receiver])
+            self.received[receiver].append(entry)
+            if receiver in self.slots:
+                self.send(self.slots[receiver], [{"cmd": "ReceivedItems", "index": index, "items": [entry]}])
+        self.send(writer, [{"cmd": "RoomUpdate", "checked_locations": packet["locations"]}])
+
+    def on_Bounce(self, writer: asyncio.StreamWriter, packet: Dict[str, Any]) -> None:
+        # Like MultiServer, a bounce goes to every client sharing one of its tags, the sender included
+        tags = set(packet.get("tags", ()))
+        bounced = dict(packet, cmd="Bounced")
+        for target, client in self.clients.items():
+            if tags & client["tags"]:
+                self.send(target, [bounced])
+
+    def on_SetNotify(self, writer: asyncio.StreamWriter, packet: Dict[str, Any]) -> None:
+        for key in packet["keys"]:
+            self.notify[key].add(writer)
+
+    def on_Set(self, writer: asyncio.StreamWriter, packet: Dict[str, Any]) -> None:
+        key = packet["key"]
+        original = value = self.storage.get(key, packet.get("default", 0))
+        for operation in packet["operations"]:
+            if operation["operation"] == "add":
+                value += operation["value"]
+            elif operation["operation"] == "max":
+                value = max(value, operation["value"])
+            elif operation["operation"] == "replace":
+                value = operation["value"]
+        self.storage[key] = value
+        # Extra fields in a Set are passed back in its SetReply
+        reply = dict(packet, cmd="SetReply", value=value, original_value=original)
+        del reply["operations"]
+        targets = set(self.notify[key])
+        if packet.get("want_reply"):
+            targets.add(writer)
+        for target in targets:
+            self.send(target, [reply])
+
+    def on_HarnessStats(self, writer: asyncio.StreamWriter, packet: Dict[str, Any]) -> None:
+        self.send(writer, [{
+            "cmd": "HarnessStats",
+            "cpu_seconds": time.process_time() - self.cpu_start,
+            "wall_seconds": time.perf_counter() - self.wall_start,
+            "packets_in": dict(self.packets_in),
+            "packets_out": dict(self.packets_out),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }])
+
+
+def serve(room: Dict[str, Any], port_queue: "multiprocessing.Queue") -> None:
+    async def main() -> None:
+        server = StandInServer(room)
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0, limit=2 ** 24)
+        port_queue.put(listener.sockets[0].getsockname()[1])
+        async with listener:
+            await listener.serve_forever()
+
+    asyncio.run(main())
+
+
+# --- Simulated clients --------------------------------------------------------------------------------------------
+
+class SimulatedClient:
+    """One PEAK game connected to the room, sending what the mod sends."""
+
+    def __init__(self, slot: int, name: str, slot_data: Dict[str, Any], checks: List[int], trap_ids: Set[int],
+                 rates: Dict[str, float], speed: float, seed: int, latencies: Dict[str, List[float]]):
+        self.slot = slot
+        self.name = name
+        self.slot_data = slot_data
+        self.checks = checks
+        self.trap_ids = trap_ids
+        self.rates = rates
+        self.speed = speed
+        self.random = random.Random(seed)
+        self.latencies = latencies
+        self.connection_id = self.random.randrange(-2 ** 31, 2 ** 31)
+        self.energy_key = "EnergyLink0"
+        self.last_death = float("-inf")
+        self.sent: Counter = Counter()
+        self.writer: Optional[asyncio.StreamWriter] = None
+        # Link changes held back by the slot's aggregation options, summed per link
+        self.pending: Counter = Counter()
+        self.aggregation = {
+            "RingLink": ("ring_link_interval", "ring_link_minimum_delta"),
+            "HardRingLink": ("ring_link_interval", "ring_link_minimum_delta"),
+            "EnergyLink": ("energy_link_interval", "energy_link_minimum_delta"),
+        }
+
+    @property
+    def tags(self) -> List[str]:
+        enabled = [("death_link", "DeathLink"), ("ring_link", "RingLink"),
+                   ("hard_ring_link", "HardRingLink"), ("trap_link", "TrapLink")]
+        return [tag for option, tag in enabled if self.slot_data.get(option)]
+
+    def send(self, *packets: Dict[str, Any]) -> None:
+        for packet in packets:
+            self.sent[packet["cmd"]] += 1
+        self.writer.write(encode(list(packets)))
+
+    def bounce(self, tag: str, data: Dict[str, Any]) -> None:
+        # harness_sent rides along in the data so every receiver can measure delivery latency
+        self.send({"cmd": "Bounce", "tags": [tag], "data": dict(data, time=time.time(), harness_sent=time.perf_counter())})
+
+    def set_energy(self, amount: int) -> None:
+        operations = [{"operation": "add", "value": amount}]
+        if amount < 0:
+            operations.append({"operation": "max", "value": 0})
+        self.send({"cmd": "Set", "key": self.energy_key, "default": 0, "want_reply": True, "operations": operations,
+                   "harness_sent": time.perf_counter()})
+
+    def on_packet(self, packet: Dict[str, Any]) -> None:
+        cmd = packet["cmd"]
+        if cmd == "Bounced":
+            data = packet.get("data", {})
+            tag = packet["tags"][0]
+            if data.get("source") in (self.connection_id, self.name):
+                return
+            self.latencies[tag].append(time.perf_counter() - data["harness_sent"])
+            if tag == "DeathLink":
+                # The mod dies to the link without sending a death of its own, at most once per throttle window
+                now = time.perf_counter()
+                if now - self.last_death >= DEATH_LINK_THROTTLE / self.speed:
+                    self.last_death = now
+        elif cmd == "SetReply" and "harness_sent" in packet:
+            self.latencies["EnergyLink"].append(time.perf_counter() - packet["harness_sent"])
+        elif cmd == "ReceivedItems" and self.slot_data.get("trap_link"):
+            for item in packet["items"]:
+                if item["item"] in self.trap_ids:
+                    self.bounce("TrapLink", {"source": self.name, "trap_name": str(item["item"])})
+
+    async def receive(self, reader: asyncio.StreamReader) -> None:
+        while line := await reader.readline():
+            for packet in json.loads(line):
+                self.on_packet(packet)
+
+    async def run(self, port: int, deadline: float) -> None:
+        reader, self.writer = await asyncio.open_connection("127.0.0.1", port, limit=2 ** 24)
+        self.send({"cmd": "Connect", "slot": self.slot, "name": self.name, "game": "PEAK", "tags": self.tags})
+        if self.slot_data.get("energy_link"):
+            self.send({"cmd": "SetNotify", "keys": [self.energy_key]})
+        receiver = asyncio.create_task(self.receive(reader))
+        flushers = [asyncio.create_task(self.flush(link)) for link, (interval, _) in self.aggregation.items()
+                    if self.slot_data.get(interval)]
+
+        # Every event type is a Poisson process; draw the next time of each and always run the earliest
+        events = [event for event in self.rates if self.rates[event] > 0 and self.enabled(event)]
+        next_at = {event: time.perf_counter() + self.delay(event) for event in events}
+        checks = iter(self.checks)
+        while next_at:
+            event = min(next_at, key=next_at.get)
+            wait = next_at[event] - time.perf_counter()
+            if next_at[event] > deadline:
+                break
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if not self.fire(event, checks):
+                del next_at[event]
+                continue
+            next_at[event] += self.delay(event)
+            await self.writer.drain()
+
+        for task in (receiver, *flushers):
+            task.cancel()
+        self.writer.close()
+
+    def relay(self, link: str, amount: int) -> None:
+        """
+        Add a link change to the pending total. With an aggregation interval the total waits for the next flush,
+        without one it is sent as soon as it reaches the minimum delta (at once when there is no minimum).
+        """
+        interval_option, minimum_option = self.aggregation[link]
+        self.pending[link] += amount
+        if not self.slot_data.get(interval_option) and abs(self.pending[link]) >= max(1, self.slot_data.get(minimum_option, 0)):
+            self.send_link(link, self.pending.pop(link))
+
+    def send_link(self, link: str, amount: int) -> None:
+        if link == "EnergyLink":
+            self.set_energy(amount)
+        else:
+            self.bounce(link, {"source": self.connection_id, "amount": amount})
+
+    async def flush(self, link: str) -> None:
+        """Every aggregation interval, send the summed change if it has reached the minimum delta."""
+        interval_option, minimum_option = self.aggregation[link]
+        interval = self.slot_data[interval_option] / 1000 / self.speed
+        minimum = max(1, self.slot_data.get(minimum_option, 0))
+        while True:
+            await asyncio.sleep(interval)
+            if abs(self.pending[link]) >= minimum:
+                self.send_link(link, self.pending.pop(link))
+                await self.writer.drain()
+
+    def enabled(self, event: str) -> bool:
+        option = {"ring_link": "ring_link", "hard_ring_link": "hard_ring_link", "death": "death_link",
+                  "energy_contribute": "energy_link", "energy_consume": "energy_link"}.get(event)
+        return option is None or bool(self.slot_data.get(option))
+
+    def delay(self, event: str) -> float:
+        return self.random.expovariate(self.rates[event] * self.speed / 60)
+
+    def fire(self, event: str, checks) -> bool:
+        """Send one event; returns False once the event has nothing left to send."""
+        if event == "check":
+            location = next(checks, None)
+            if location is None:
+                return False
+            self.send({"cmd": "LocationChecks", "locations": [location]})
+        elif event in ("ring_link", "hard_ring_link"):
+            amount = self.random.choice((5, 10, 25, -10))
+            self.relay("RingLink" if event == "ring_link" else "HardRingLink", amount)
+        elif event == "energy_contribute":
+            self.relay("EnergyLink", self.random.choice((25, 100, 250)))
+        elif event == "energy_consume":
+            self.set_energy(-100)
+        elif event == "death":
+            now = time.perf_counter()
+            if now - self.last_death >= DEATH_LINK_THROTTLE / self.speed:
+                self.last_death = now
+                self.bounce("DeathLink", {"source": self.name, "cause": f"{self.name} fell"})
+        return True
+
+
+async def drive(room: Dict[str, Any], port: int, args: argparse.Namespace) -> Dict[str, Any]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    rates = {event: getattr(args, f"{event}_rate") for event in DEFAULT_RATES}
+    trap_ids = set(room["trap_ids"])
+    clients = [
+        SimulatedClient(int(player), room["names"][player], room["slot_data"][player], room["checks"][player],
+                        trap_ids, rates, args.speed, args.seed * 1000 + int(player), latencies)
+        for player in room["slot_data"]
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*(client.run(port, start + args.duration) for client in clients))
+    await asyncio.sleep(0.5)  # Let in-flight relays land before reading the server's counters
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=2 ** 24)
+    writer.write(encode([{"cmd": "HarnessStats"}]))
+    stats = json.loads(await reader.readline())[0]
+    writer.close()
+
+    client_sent = sum((client.sent for client in clients), Counter())
+    return {
+        "clients": len(clients),
+        "duration_seconds": args.duration,
+        "speed": args.speed,
+        "client_packets_sent": dict(client_sent),
+        "server": {
+            "cpu_seconds": stats["cpu_seconds"],
+            "cpu_percent": 100 * stats["cpu_seconds"] / stats["wall_seconds"],
+            "packets_in_per_second": sum(stats["packets_in"].values()) / args.duration,
+            "packets_out_per_second": sum(stats["packets_out"].values()) / args.duration,
+            "bytes_out_per_second": stats["bytes_out"] / args.duration,
+            "packets_in": stats["packets_in"],
+            "packets_out": stats["packets_out"],
+        },
+        "latency": {tag: percentiles(samples) for tag, samples in sorted(latencies.items())},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_archipelago_arguments(parser)
+    parser.add_argument("--clients", type=int, default=32, help="PEAK slots, one simulated client each")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of wall time to simulate")
+    parser.add_argument("--speed", type=float, default=10, help="Play-time minutes compressed into each wall minute")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--trap-percentage", type=int, default=20)
+    parser.add_argument("--ring-link-interval", type=int, default=0, help="Ring Link Aggregation Interval option, ms")
+    parser.add_argument("--ring-link-minimum-delta", type=int, default=0, help="Ring Link Minimum Delta option")
+    parser.add_argument("--energy-link-interval", type=int, default=0, help="Energy Link Aggregation Interval option, ms")
+    parser.add_argument("--energy-link-minimum-delta", type=int, default=0, help="Energy Link Minimum Delta option")
+    for event, rate in DEFAULT_RATES.items():
+        parser.add_argument(f"--{event.replace('_', '-')}-rate", type=float, default=rate,
+                            help=f"{event.replace('_', ' ')} events per client per minute of play (default {rate})")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    load_archipelago(args.archipelago, args.allow_unpinned)
+    options = {"ring_link": 1, "hard_ring_link": 1, "energy_link": 1, "trap_link": 1, "death_link": 1,
+               "trap_percentage": args.trap_percentage, "ring_link_interval": args.ring_link_interval,
+               "ring_link_minimum_delta": args.ring_link_minimum_delta, "energy_link_interval": args.energy_link_interval,
+               "energy_link_minimum_delta": args.energy_link_minimum_delta}
+    room = json.loads(json.dumps(generate_room(args.clients, args.seed, options)))  # The form the server sees
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(room, port_queue), daemon=True)
+    server.start()
+    try:
+        report = asyncio.run(drive(room, port_queue.get(timeout=30), args))
+    finally:
+        server.terminate()
+        server.join()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    server_stats = report["server"]
+    print(f"{report['clients']} clients, {report['duration_seconds']:.0f}s at {report['speed']:g}x")
+    print(f"server: {server_stats['packets_in_per_second']:.0f} packets/s in, "
+          f"{server_stats['packets_out_per_second']:.0f} packets/s out, "
+          f"{server_stats['bytes_out_per_second'] / 1024:.0f} KiB/s out, CPU {server_stats['cpu_percent']:.1f}%")
+    for cmd, count in sorted(server_stats["packets_out"].items(), key=lambda item: -item[1]):
+        print(f"  {cmd:<16} {count:8d} out")
+    for tag, latency in report["latency"].items():
+        print(f"  {tag:<16} n={latency['count']:<7d} p50 {latency['p50_ms']:6.2f} ms  "
+              f"p90 {latency['p90_ms']:6.2f} ms  p99 {latency['p99_ms']:6.2f} ms  max {latency['max_ms']:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Option-space validation sweep for the PEAK world.
+
+Generates a seed for every combination of goal, ascent count, stamina toggles
+and trap mix on a process pool, and writes one summary covering timing,
+success or failure, item pool size against fillable location count, and
+unreachable locations.
+
+    python tools/seed_sweep.py --archipelago ../Archipelago --jobs 32 --json sweep.json
+
+Every job's seed is derived from --seed and the job's options, so a job
+generates the same multiworld on every run, whatever the worker count or
+scheduling order.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List
+
+from apcore import GEN_STEPS, add_archipelago_arguments, build_multiworld, load_archipelago, run_fill, run_step
+
+TRAP_OPTION_NAMES: List[str] = []  # Filled in per process from the trap registry
+
+# Trap weight presets; None means "leave every trap weight at its default"
+TRAP_MIXES: Dict[str, Dict[str, Any]] = {
+    "no_traps": {"trap_percentage": 0, "weight": 0},
+    "default": {"trap_percentage": 10, "weight": None},
+    "all_high": {"trap_percentage": 50, "weight": 4},
+    "all_traps": {"trap_percentage": 100, "weight": 1},
+}
+
+
+def build_matrix(goals: List[int], ascents: List[int], mixes: List[str]) -> List[Dict[str, Any]]:
+    jobs = []
+    for goal, ascent_count, stamina, extra_bars, mix in itertools.product(goals, ascents, (0, 1), (0, 1), mixes):
+        jobs.append({
+            "goal": goal,
+            "ascent_count": ascent_count,
+            "progressive_stamina": stamina,
+            "additional_stamina_bars": extra_bars,
+            "trap_mix": mix,
+        })
+    return jobs
+
+
+def job_seed(base_seed: int, job: Dict[str, Any]) -> int:
+    key = f"{base_seed}:" + ",".join(f"{name}={job[name]}" for name in sorted(job))
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big")
+
+
+def _init_worker(archipelago: str, allow_unpinned: bool) -> None:
+    logging.disable(logging.WARNING)
+    # Fail the job on the spot if a slot's item pool does not match its locations
+    load_archipelago(archipelago, allow_unpinned).strict_pool_check = True
+    from worlds.peak.Options import trap_registry
+    TRAP_OPTION_NAMES[:] = [trap.option_name for trap in trap_registry]
+
+
+def _job_options(job: Dict[str, Any]) -> Dict[str, Any]:
+    options = {name: value for name, value in job.items() if name != "trap_mix"}
+    mix = TRAP_MIXES[job["trap_mix"]]
+    options["trap_percentage"] = mix["trap_percentage"]
+    if mix["weight"] is not None:
+        options.update(dict.fromkeys(TRAP_OPTION_NAMES, mix["weight"]))
+    return options
+
+
+def run_job(job: Dict[str, Any], seed: int, slots: int) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"job": job, "seed": seed, "ok": False}
+    start = time.perf_counter()
+    try:
+        multiworld = build_multiworld(slots, _job_options(job), seed)
+        for step in GEN_STEPS:
+            run_step(multiworld, step)
+
+        fillable = Counter(loc.player for loc in multiworld.get_locations() if loc.item is None)
+        pool = Counter(item.player for item in multiworld.itempool)
+        result["pool_delta"] = {player: pool[player] - fillable[player] for player in multiworld.player_ids}
+
+        run_fill(multiworld)
+        for world in multiworld.worlds.values():
+            world.fill_slot_data()
+
+        state = multiworld.get_all_state(False)
+        result["unreachable"] = sorted(
+            f"{multiworld.player_name[loc.player]}: {loc.name}"
+            for loc in multiworld.get_locations() if not loc.can_reach(state)
+        )
+        result["beatable"] = multiworld.can_beat_game()
+        result["ok"] = result["beatable"] and not result["unreachable"] and not any(result["pool_delta"].values())
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+        result["traceback"] = traceback.format_exc()
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_archipelago_arguments(parser)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--slots", type=int, default=1, help="PEAK slots per generated multiworld")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed every job seed is derived from")
+    parser.add_argument("--goals", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--ascents", type=int, nargs="+", default=list(range(8)))
+    parser.add_argument("--trap-mixes", nargs="+", default=list(TRAP_MIXES), choices=list(TRAP_MIXES))
+    parser.add_argument("--json", type=Path, help="Write the full summary to this file")
+    args = parser.parse_args()
+
+    jobs = build_matrix(args.goals, args.ascents, args.trap_mixes)
+    json_path = args.json.resolve() if args.json else None
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(args.jobs, initializer=_init_worker,
+                             initargs=(args.archipelago, args.allow_unpinned)) as pool:
+        futures = [pool.submit(run_job, job, job_seed(args.seed, job), args.slots) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if not result["ok"]:
+                reason = result.get("error") or (
+                    f"beatable={result['beatable']} unreachable={len(result['unreachable'])} "
+                    f"pool_delta={result['pool_delta']}"
+                )
+                print(f"FAIL {result['job']} seed={result['seed']}: {reason}")
+    results.sort(key=lambda result: jobs.index(result["job"]))
+
+    durations = sorted(result["seconds"] for result in results)
+    summary = {
+        "jobs": len(results),
+        "passed": sum(result["ok"] for result in results),
+        "errors": sum("error" in result for result in results),
+        "wall_seconds": time.perf_counter() - start,
+        "job_seconds": {
+            "min": durations[0],
+            "median": durations[len(durations) // 2],
+            "max": durations[-1],
+            "total": sum(durations),
+        },
+        "results": results,
+    }
+    print(f"{summary['passed']}/{summary['jobs']} passed, {summary['errors']} errors, "
+          f"{summary['wall_seconds']:.1f}s wall, median job {summary['job_seconds']['median'] * 1000:.0f} ms")
+
+    if json_path:
+        json_path.write_text(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Death Link bounce volume with and without coalescing and a per-minute cap.
+
+Event simulation of a room of PEAK games with death_link on and
+death_link_behavior = kill_random_player. A wipe in one lobby sends a Death
+Link per death. Every other game that receives one kills a random player in
+its lobby, and that death is sent on in turn (with --echo probability). The
+cascade only slows down through the mod's 5 second send/receive throttles and
+players' revive time.
+
+Lobbies also lose players to ordinary deaths at --death-rate per minute.
+Each setting of death_link_coalesce_window / death_link_max_per_minute is run
+on the same seeds and compared with the first (normally 0 / 0, today's
+behavior):
+
+    python tools/sim_deathlink.py --games 30 --settings 0:0 5:0 10:0 0:6 10:4
+"""
+import argparse
+import heapq
+import random
+import statistics
+from collections import deque
+from typing import Dict, List, NamedTuple, Tuple
+
+# The mod ignores a death sent or received within this many seconds of the last one
+MOD_THROTTLE = 5.0
+
+
+class Setting(NamedTuple):
+    window: float  # death_link_coalesce_window, seconds
+    max_per_minute: int  # death_link_max_per_minute, 0 for no cap
+
+    def __str__(self) -> str:
+        return f"window={self.window:g}s cap={self.max_per_minute or '-'}/min"
+
+
+class Game:
+    def __init__(self, players: int):
+        self.dead_until = [0.0] * players
+        self.last_sent = float("-inf")
+        self.last_received = float("-inf")
+        self.sent_times: deque = deque()
+
+
+def simulate(setting: Setting, games: int, players: int, duration: float, revive: float, echo: float,
+             wipe_spread: float, death_rate: float, seed: int) -> Dict[str, int]:
+    rng = random.Random(seed)
+    room = [Game(players) for _ in range(games)]
+    events: List[Tuple[float, int, str, int]] = []
+    order = 0  # Tie-breaker so events at equal times keep insertion order
+
+    def push(at: float, kind: str, game: int) -> None:
+        nonlocal order
+        order += 1
+        heapq.heappush(events, (at, order, kind, game))
+
+    # One lobby wipes at t=0: every player dies within wipe_spread seconds
+    for player in range(players):
+        room[0].dead_until[player] = revive
+        push(rng.uniform(0, wipe_spread), "death", 0)
+
+    # Ordinary deaths in every lobby, death_rate per lobby per minute
+    for index in range(games):
+        at = 0.0
+        while death_rate and (at := at + rng.expovariate(death_rate / 60)) < duration:
+            push(at, "fall", index)
+
+    counts = {"deaths": players, "sent": 0, "delivered": 0, "dropped_by_cap": 0, "coalesced": 0}
+    receive_window = max(MOD_THROTTLE, setting.window)
+
+    while events:
+        now, _, kind, index = heapq.heappop(events)
+        if now > duration:
+            break
+        game = room[index]
+
+        if kind == "fall":
+            alive = [player for player, until in enumerate(game.dead_until) if until <= now]
+            if not alive:
+                continue
+            game.dead_until[rng.choice(alive)] = now + revive
+            counts["deaths"] += 1
+            kind = "death"
+
+        if kind == "death":
+            # Deaths within the window of the last Death Link sent or received are folded into it
+            if now - max(game.last_sent, game.last_received) < setting.window:
+                counts["coalesced"] += 1
+                continue
+            if now - game.last_sent < MOD_THROTTLE:
+                continue
+            while game.sent_times and now - game.sent_times[0] >= 60:
+                game.sent_times.popleft()
+            if setting.max_per_minute and len(game.sent_times) >= setting.max_per_minute:
+                counts["dropped_by_cap"] += 1
+                continue
+            game.last_sent = now
+            game.sent_times.append(now)
+            counts["sent"] += 1
+            for other in range(games):
+                if other != index:
+                    counts["delivered"] += 1
+                    push(now + rng.uniform(0.05, 0.3), "receive", other)
+
+        elif kind == "receive":
+            if now - game.last_received < receive_window:
+                continue
+            game.last_received = now
+            alive = [player for player, until in enumerate(game.dead_until) if until <= now]
+            if not alive:
+                continue
+            game.dead_until[rng.choice(alive)] = now + revive
+            counts["deaths"] += 1
+            if rng.random() < echo:
+                push(now, "death", index)
+
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=30, help="PEAK games in the room with Death Link on")
+    parser.add_argument("--players", type=int, default=4, help="Players per PEAK lobby")
+    parser.add_argument("--duration", type=float, default=600, help="Seconds simulated after the wipe")
+    parser.add_argument("--revive", type=float, default=60, help="Seconds before a dead player can die again")
+    parser.add_argument("--echo", type=float, default=1.0,
+                        help="Chance a death caused by a Death Link is sent on as a new one")
+    parser.add_argument("--wipe-spread", type=float, default=8, help="Seconds over which the initial wipe happens")
+    parser.add_argument("--death-rate", type=float, default=0.5, help="Ordinary deaths per lobby per minute")
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--settings", nargs="+", default=["0:0", "5:0", "10:0", "0:6", "10:4"],
+                        help="window:max_per_minute pairs; the first is the baseline")
+    args = parser.parse_args()
+
+    settings = [Setting(float(window), int(cap)) for window, cap in (pair.split(":") for pair in args.settings)]
+    results = {
+        setting: [simulate(setting, args.games, args.players, args.duration, args.revive, args.echo,
+                           args.wipe_spread, args.death_rate, seed) for seed in range(args.seeds)]
+        for setting in settings
+    }
+
+    baseline = statistics.fmean(run["delivered"] for run in results[settings[0]])
+    print(f"{args.games} games x {args.players} players, {args.duration:g}s after one wipe, "
+          f"{args.death_rate:g} deaths/lobby/min, "
+          f"mean of {args.seeds} seeds")
+    for setting, runs in results.items():
+        mean = {key: statistics.fmean(run[key] for run in runs) for key in runs[0]}
+        change = 100 * (mean["delivered"] - baseline) / baseline if baseline else 0.0
+        print(f"  {str(setting):<24} sent {mean['sent']:7.1f}  bounces {mean['delivered']:8.1f} ({change:+6.1f}%)  "
+              f"deaths {mean['deaths']:7.1f}  coalesced {mean['coalesced']:6.1f}  capped {mean['dropped_by_cap']:6.1f}")
+
+
+if __name__ == "__main__":
+    main()